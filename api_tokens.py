@@ -0,0 +1,242 @@
+"""
+API Token Authentication
+========================
+Lets machine clients authenticate with a per-user token instead of
+posting the login form.
+
+    Authorization: Bearer fd_<token id>_<secret>
+
+The secret is high-entropy random data, so it is stored as an
+HMAC-SHA256 digest keyed with API_TOKEN_SECRET rather than with the
+deliberately slow password KDF: verifying a token is one HMAC plus a
+constant-time comparison.
+
+Token lookups are cached in memory per worker for API_TOKEN_CACHE_TTL
+seconds (default 5), so repeat calls do not touch the api_tokens table.
+Unknown and revoked token IDs are cached too, so garbage tokens do not
+cost a database read each. `warm_token_cache()` preloads active tokens
+when a worker starts (see warmup.py).
+
+Caches are per process and nothing tells other workers about a
+revocation: a revoked token keeps working for up to API_TOKEN_CACHE_TTL
+seconds on every worker that cached it (the worker handling
+`DELETE /api/tokens/<id>` drops it at once). For the same reason a new
+token can be refused for up to that long on a worker that saw its ID
+before it was issued.
+
+Tokens are managed with:
+    flask --app run tokens create <username> --name "deploy script"
+    flask --app run tokens list <username>
+    flask --app run tokens revoke <token id>
+or revoked by their owner (or an admin) via DELETE /api/tokens/<id>.
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+from db_routing import use_primary
+from extensions import db
+from models.api_token import ApiToken
+from models.user import User
+
+# Prefix identifying our tokens (helps secret scanners and log redaction)
+TOKEN_PREFIX = 'fd'
+
+# Longest token ID accepted; keeps IDs within a signed 64-bit integer
+MAX_TOKEN_ID_DIGITS = 18
+
+
+class TokenCache:
+    """
+    Bounded, thread-safe TTL cache of token lookups.
+
+    Entries map token ID -> (token_hash, user_id, expires_at); a
+    token_hash of None records that the ID is unknown or revoked.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token_id):
+        """
+        Get the cached record for `token_id`.
+
+        Returns:
+            (token_hash, user_id), (None, None) for a cached miss, or
+            None if not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(token_id)
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                del self._entries[token_id]
+                return None
+            return entry[0], entry[1]
+
+    def set(self, token_id, token_hash, user_id, ttl, max_size):
+        """Cache a token record, evicting the oldest entries beyond `max_size`."""
+        with self._lock:
+            self._entries[token_id] = (token_hash, user_id, time.monotonic() + ttl)
+            self._entries.move_to_end(token_id)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token_id):
+        """Drop `token_id` from the cache."""
+        with self._lock:
+            self._entries.pop(token_id, None)
+
+    def clear(self):
+        """Drop every cached record."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Per-process cache shared by all requests in this worker
+token_cache = TokenCache()
+
+
+def hash_secret(secret):
+    """
+    Compute the stored digest of a token secret.
+
+    Args:
+        secret: Token secret (the part after the token ID)
+
+    Returns:
+        Hex HMAC-SHA256 digest
+    """
+    key = current_app.config['API_TOKEN_SECRET'].encode('utf-8')
+    return hmac.new(key, secret.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def issue_token(user, name):
+    """
+    Create a new API token for `user`.
+
+    Args:
+        user: User who owns the token
+        name: Label for the token
+
+    Returns:
+        (ApiToken, plaintext token); the plaintext cannot be recovered later
+    """
+    secret = secrets.token_urlsafe(32)
+    token = ApiToken(user=user, name=name, token_hash=hash_secret(secret))
+    db.session.add(token)
+    db.session.commit()
+    token_cache.invalidate(token.id)
+    return token, f'{TOKEN_PREFIX}_{token.id}_{secret}'
+
+
+def revoke_token(token):
+    """
+    Revoke `token` and drop it from this worker's cache.
+
+    Args:
+        token: ApiToken instance
+    """
+    token.revoked_at = datetime.utcnow()
+    db.session.commit()
+    token_cache.invalidate(token.id)
+
+
+def _parse(raw_token):
+    """
+    Split a raw token into (token_id, secret).
+
+    Returns:
+        Tuple, or None if the token is malformed
+    """
+    parts = raw_token.split('_', 2)
+    if len(parts) != 3 or parts[0] != TOKEN_PREFIX:
+        return None
+    # isdigit() alone also accepts e.g. '²', which int() rejects
+    token_id = parts[1]
+    if not (token_id.isascii() and token_id.isdecimal()) or len(token_id) > MAX_TOKEN_ID_DIGITS:
+        return None
+    return int(token_id), parts[2]
+
+
+def verify_token(raw_token):
+    """
+    Check a raw token and find its owner.
+
+    Args:
+        raw_token: Token string from the Authorization header
+
+    Returns:
+        User ID, or None if the token is unknown, revoked or wrong
+    """
+    parsed = _parse(raw_token)
+    if parsed is None:
+        return None
+    token_id, secret = parsed
+
+    record = token_cache.get(token_id)
+    if record is None:
+        # Read from the primary so a just-revoked token is never accepted
+        with use_primary():
+            token = db.session.get(ApiToken, token_id)
+        if token is None or not token.is_active:
+            record = (None, None)
+        else:
+            record = (token.token_hash, token.user_id)
+        config = current_app.config
+        token_cache.set(token_id, *record,
+                        config['API_TOKEN_CACHE_TTL'], config['API_TOKEN_CACHE_SIZE'])
+
+    token_hash, user_id = record
+    if token_hash is None or not hmac.compare_digest(hash_secret(secret), token_hash):
+        return None
+    return user_id
+
+
+def warm_token_cache():
+    """
+    Load every active token into this worker's cache.
+
+    Returns:
+        Number of tokens cached
+    """
+    config = current_app.config
+    with use_primary():
+        tokens = db.session.query(ApiToken.id, ApiToken.token_hash, ApiToken.user_id) \
+            .filter(ApiToken.revoked_at.is_(None)) \
+            .order_by(ApiToken.id.desc()) \
+            .limit(config['API_TOKEN_CACHE_SIZE']).all()
+    for token_id, token_hash, user_id in tokens:
+        token_cache.set(token_id, token_hash, user_id,
+                        config['API_TOKEN_CACHE_TTL'], config['API_TOKEN_CACHE_SIZE'])
+    return len(tokens)
+
+
+def load_user_from_request(request):
+    """
+    Flask-Login request_loader: authenticate via `Authorization: Bearer`.
+
+    Args:
+        request: Current Flask request
+
+    Returns:
+        User or None
+    """
+    header = request.headers.get('Authorization', '')
+    scheme, _, raw_token = header.partition(' ')
+    if scheme.lower() != 'bearer' or not raw_token:
+        return None
+
+    user_id = verify_token(raw_token.strip())
+    if user_id is None:
+        return None
+    return User.query.execution_options(all_tenants=True).get(user_id)
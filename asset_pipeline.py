@@ -0,0 +1,269 @@
+"""
+Static Asset Pipeline
+=====================
+Builds and serves self-hosted, fingerprinted CSS/JS bundles.
+
+Sources live in `assets/` (application CSS plus vendored Bootstrap and
+Popper, see `assets/vendor/README.md`). `build_assets()` concatenates
+each bundle in `BUNDLES`, minifies non-minified CSS, names the output
+after a hash of its content (`css/app.3f9c2a1b7d4e.css`) and writes it
+to `static/dist/` together with `manifest.json` and, if
+ASSETS_PRECOMPRESS is set, `.gz`/`.br` siblings.
+
+Templates reference bundles by logical name:
+    <link href="{{ asset_url('css/app.css') }}" rel="stylesheet">
+
+Because a fingerprinted file never changes, `/static/dist/` is served
+with a one-year `immutable` Cache-Control, and a precompressed sibling
+is sent directly when the client accepts it.
+
+Builds only add files: every file is written under a temporary name and
+renamed into place, and earlier fingerprints are kept, so concurrent
+builds never collide and pages still linking the previous bundle during
+a rolling deploy keep working.
+
+Build with: flask --app run assets build
+(In debug mode, or with ASSETS_AUTO_BUILD, a missing manifest is built
+on first use instead.)
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import tempfile
+from flask import current_app, request, send_from_directory, url_for
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; only .gz siblings are written
+    brotli = None
+
+# Logical bundle name -> source files (relative to the assets folder)
+BUNDLES = {
+    'css/app.css': [
+        'vendor/bootstrap/bootstrap.min.css',
+        'css/app.css',
+    ],
+    'js/app.js': [
+        'vendor/popper/popper.min.js',
+        'vendor/bootstrap/bootstrap.min.js',
+    ],
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+# Precompressed siblings in order of preference: (Content-Encoding, suffix)
+PRECOMPRESSED = [('br', '.br'), ('gzip', '.gz')]
+
+# Source map references point at files we do not ship
+_SOURCE_MAP_RE = re.compile(r'^\s*(//# sourceMappingURL=.*|/\*# sourceMappingURL=.*\*/)\s*$', re.MULTILINE)
+_CSS_COMMENT_RE = re.compile(r'/\*(?!!).*?\*/', re.DOTALL)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+
+
+def source_folder(app):
+    """Folder holding asset sources."""
+    return os.path.join(app.root_path, 'assets')
+
+
+def output_folder(app):
+    """Folder receiving built assets."""
+    return os.path.join(app.static_folder, 'dist')
+
+
+def minify_css(css):
+    """
+    Minify CSS by removing comments and redundant whitespace.
+
+    License comments (`/*! ... */`) are kept.
+
+    Args:
+        css: CSS source text
+
+    Returns:
+        Minified CSS text
+    """
+    css = _CSS_COMMENT_RE.sub('', css)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    css = _CSS_COLON_RE.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def _read_source(path):
+    """Read one source file, minifying it if it is not already minified."""
+    with open(path, encoding='utf-8') as f:
+        text = _SOURCE_MAP_RE.sub('', f.read()).strip()
+    if path.endswith('.css') and not path.endswith('.min.css'):
+        text = minify_css(text)
+    return text
+
+
+def build_assets(app):
+    """
+    Build every bundle into the output folder and write the manifest.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        Manifest dict mapping logical names to fingerprinted paths
+    """
+    src = source_folder(app)
+    out = output_folder(app)
+    os.makedirs(out, exist_ok=True)
+
+    manifest = {}
+    for name, sources in BUNDLES.items():
+        separator = '\n;\n' if name.endswith('.js') else '\n'
+        content = separator.join(_read_source(os.path.join(src, path)) for path in sources)
+        data = (content + '\n').encode('utf-8')
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        base, ext = os.path.splitext(name)
+        hashed_name = f'{base}.{digest}{ext}'
+        target = os.path.join(out, hashed_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        # Same name means same content, so an existing file is already right
+        if not os.path.exists(target):
+            if app.config['ASSETS_PRECOMPRESS']:
+                _write_precompressed(target, data)
+            _write_atomic(target, data)
+
+        manifest[name] = hashed_name
+
+    # Written last: the manifest only ever points at complete files
+    _write_atomic(os.path.join(out, MANIFEST_NAME),
+                  json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    app.extensions['assets_manifest'] = manifest
+    return manifest
+
+
+def _write_atomic(path, data):
+    """Write `path` through a temporary file and rename, so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write_precompressed(target, data):
+    """Write `.gz` (and `.br` if available) siblings of `target`."""
+    _write_atomic(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(target + '.br', brotli.compress(data, quality=11))
+
+
+def load_manifest(app):
+    """
+    Load the asset manifest.
+
+    The manifest is cached per process; in debug mode it is re-read on
+    every call so `flask assets build` is picked up without a restart.
+    A missing manifest is built only in debug mode or with
+    ASSETS_AUTO_BUILD; otherwise building is a deploy step.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        Manifest dict
+    """
+    manifest = app.extensions.get('assets_manifest')
+    if manifest is not None and not app.debug:
+        return manifest
+
+    path = os.path.join(output_folder(app), MANIFEST_NAME)
+    if not os.path.exists(path):
+        if not (app.debug or app.config['ASSETS_AUTO_BUILD']):
+            raise RuntimeError('Asset manifest not found; run "flask --app run assets build".')
+        app.logger.info('Asset manifest not found, building assets into %s', output_folder(app))
+        return build_assets(app)
+
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    app.extensions['assets_manifest'] = manifest
+    return manifest
+
+
+def asset_url(name):
+    """
+    Jinja helper returning the URL of a fingerprinted bundle.
+
+    Args:
+        name: Logical bundle name, e.g. 'css/app.css'
+
+    Returns:
+        URL such as '/static/dist/css/app.3f9c2a1b7d4e.css'
+    """
+    manifest = load_manifest(current_app)
+    if name not in manifest:
+        raise KeyError(f'Unknown asset bundle "{name}".')
+    return url_for('assets', filename=manifest[name])
+
+
+def serve_asset(filename):
+    """
+    Serve a built asset with far-future caching.
+
+    Sends the best precompressed sibling the client accepts, falling
+    back to the plain file.
+
+    Args:
+        filename: Path relative to the output folder
+
+    Returns:
+        File response
+    """
+    out = output_folder(current_app)
+    if (
+        filename == MANIFEST_NAME
+        or filename.endswith(tuple(suffix for _, suffix in PRECOMPRESSED))
+        or safe_join(out, filename) is None
+    ):
+        raise NotFound()
+
+    mimetype = mimetypes.guess_type(filename)[0]
+    max_age = current_app.config['ASSETS_MAX_AGE']
+
+    for encoding, suffix in PRECOMPRESSED:
+        if request.accept_encodings[encoding] > 0 and os.path.isfile(os.path.join(out, filename + suffix)):
+            response = send_from_directory(out, filename + suffix, mimetype=mimetype, max_age=max_age)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(out, filename, mimetype=mimetype, max_age=max_age)
+
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_assets(app):
+    """
+    Register the asset route and the `asset_url()` template helper.
+
+    Args:
+        app: Flask application instance
+    """
+    app.add_url_rule(
+        app.static_url_path + '/dist/<path:filename>',
+        endpoint='assets',
+        view_func=serve_asset,
+    )
+    app.add_template_global(asset_url)
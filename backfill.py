@@ -0,0 +1,195 @@
+"""
+Online Backfills
+================
+Framework for data backfills that run alongside live traffic.
+
+Schema changes go through Alembic migrations (see `migrations/`), but
+rewriting data in a large table inside a migration holds locks for the
+whole UPDATE. Backfills instead walk the table in primary-key ranges,
+commit after every chunk and pause between chunks, so each transaction
+only touches `batch_size` rows. Progress is stored in the
+`backfill_progress` table, which makes every backfill resumable.
+
+Register a backfill with the `@backfill` decorator and run it with:
+    flask --app run backfill run <name>
+"""
+
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func, select, update
+from extensions import db
+from models.backfill import BackfillProgress
+from models.user import User
+
+
+# Registered backfills, keyed by name
+BACKFILLS = {}
+
+
+class Backfill:
+    """
+    A registered backfill.
+
+    Attributes:
+        name: Unique backfill name (used on the CLI and in progress rows)
+        model: Model whose table is walked by primary key
+        apply: Callable(start, end) that updates rows with start < id <= end
+            and returns the number of rows changed
+        description: One-line description shown by `backfill list`
+    """
+
+    def __init__(self, name, model, apply, description=''):
+        self.name = name
+        self.model = model
+        self.apply = apply
+        self.description = description
+
+    @property
+    def primary_key(self):
+        """Integer primary key column used to build chunk ranges."""
+        return self.model.__mapper__.primary_key[0]
+
+    def next_chunk_end(self, last_id, batch_size):
+        """
+        Find the upper bound of the next chunk.
+
+        Args:
+            last_id: Highest primary key already processed
+            batch_size: Maximum number of rows in the chunk
+
+        Returns:
+            Upper primary key (inclusive) or None when no rows remain
+        """
+        pk = self.primary_key
+        end = db.session.execute(
+            select(pk).where(pk > last_id).order_by(pk)
+            .offset(batch_size - 1).limit(1)
+        ).scalar()
+        if end is None:
+            # Fewer than batch_size rows left: the last chunk ends at max(id)
+            end = db.session.execute(select(func.max(pk)).where(pk > last_id)).scalar()
+        return end
+
+
+def backfill(name, model, description=''):
+    """
+    Decorator to register a backfill.
+
+    Usage:
+        @backfill('my-backfill', model=User)
+        def my_backfill(start, end):
+            return db.session.execute(update(User).where(...)).rowcount
+    """
+    def decorator(f):
+        if name in BACKFILLS:
+            raise ValueError(f'Backfill "{name}" is already registered.')
+        BACKFILLS[name] = Backfill(name, model, f, description or (f.__doc__ or '').strip())
+        return f
+    return decorator
+
+
+def get_progress(name):
+    """
+    Load (or create) the progress row for a backfill.
+
+    Args:
+        name: Registered backfill name
+
+    Returns:
+        BackfillProgress instance
+    """
+    progress = db.session.get(BackfillProgress, name)
+    if progress is None:
+        progress = BackfillProgress(name=name, last_id=0, rows_updated=0)
+        db.session.add(progress)
+        db.session.commit()
+    return progress
+
+
+def run_backfill(name, batch_size=None, sleep=None, max_batches=None, echo=None):
+    """
+    Run (or resume) a registered backfill in throttled chunks.
+
+    Each chunk updates rows in the primary-key range (last_id, end],
+    records the new position and commits in the same transaction, so
+    stopping the process at any point loses at most one chunk of work.
+
+    Args:
+        name: Registered backfill name
+        batch_size: Rows per chunk (defaults to BACKFILL_BATCH_SIZE)
+        sleep: Seconds to pause between chunks (defaults to BACKFILL_SLEEP_SECONDS)
+        max_batches: Stop after this many chunks (None runs to completion)
+        echo: Optional callable receiving a progress line after each chunk
+
+    Returns:
+        BackfillProgress instance after the run
+    """
+    if name not in BACKFILLS:
+        raise KeyError(f'Unknown backfill "{name}".')
+    job = BACKFILLS[name]
+
+    if batch_size is None:
+        batch_size = current_app.config['BACKFILL_BATCH_SIZE']
+    if sleep is None:
+        sleep = current_app.config['BACKFILL_SLEEP_SECONDS']
+
+    progress = get_progress(name)
+    batches = 0
+
+    while not progress.is_complete:
+        if max_batches is not None and batches >= max_batches:
+            break
+
+        end = job.next_chunk_end(progress.last_id, batch_size)
+        if end is None:
+            progress.completed_at = datetime.utcnow()
+            db.session.commit()
+            break
+
+        try:
+            changed = job.apply(progress.last_id, end) or 0
+            progress.last_id = end
+            progress.rows_updated += changed
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        batches += 1
+        if echo:
+            echo(f'{name}: processed up to id {end} ({progress.rows_updated} rows updated)')
+        if sleep:
+            time.sleep(sleep)
+
+    return progress
+
+
+def reset_backfill(name):
+    """
+    Forget the stored progress of a backfill so it starts over.
+
+    Args:
+        name: Registered backfill name
+    """
+    progress = db.session.get(BackfillProgress, name)
+    if progress:
+        db.session.delete(progress)
+        db.session.commit()
+
+
+# ---------------------------------------------------------------------------
+# Registered backfills
+# ---------------------------------------------------------------------------
+
+@backfill('default-profile-image', model=User)
+def default_profile_image(start, end):
+    """Set profile_image to 'default.jpg' where it is NULL."""
+    statement = (
+        update(User)
+        .where(User.id > start, User.id <= end, User.profile_image.is_(None))
+        # Keep updated_at untouched: this is a data fix, not a user edit
+        .values(profile_image='default.jpg', updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.execute(statement).rowcount
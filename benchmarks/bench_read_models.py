@@ -0,0 +1,132 @@
+"""
+Read Model Benchmark
+====================
+Compares memory and latency of loading the user list through full ORM
+instances versus the read models in models/read_models.py.
+
+Run from the project root:
+    python -m benchmarks.bench_read_models [--rows 100000] [--repeat 3]
+
+Uses a throwaway SQLite file, so it does not touch the app database.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from flask import Flask
+from extensions import db
+from models.organization import Organization
+from models.user import User
+from models.read_models import iter_user_summaries, list_user_summaries
+
+
+def create_app(database_path):
+    """Create a minimal app bound to `database_path`."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def populate(rows):
+    """Insert `rows` users into one organization."""
+    db.create_all()
+    org = Organization(name='Bench', slug='bench')
+    db.session.add(org)
+    db.session.commit()
+
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        batch.append({
+            'org_id': org.id,
+            'username': f'user{i}',
+            'email': f'user{i}@example.com',
+            'password_hash': 'scrypt:32768:8:1$' + 'x' * 100,
+            'role': 'admin' if i % 50 == 0 else 'user',
+            'profile_image': 'default.jpg',
+            'created_at': start + timedelta(seconds=i),
+            'updated_at': start + timedelta(seconds=i),
+        })
+        if len(batch) == 10000:
+            db.session.execute(User.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(User.__table__.insert(), batch)
+    db.session.commit()
+
+
+def orm_list():
+    """Baseline: what list_users used to do."""
+    return User.query.order_by(User.created_at.desc()).all()
+
+
+def summary_list():
+    """Column-only rows in __slots__ objects."""
+    return list_user_summaries()
+
+
+def summary_stream():
+    """Streamed rows, consumed one at a time like an export."""
+    count = 0
+    for _ in iter_user_summaries():
+        count += 1
+    return count
+
+
+def measure(fn, repeat):
+    """
+    Run `fn` and report best latency and peak traced memory.
+
+    The result is kept alive until measurement ends, as a view would
+    hold it while rendering.
+
+    Returns:
+        (best seconds, peak bytes)
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+        del result
+
+    db.session.expunge_all()
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(os.path.join(tmp, 'bench.db'))
+        with app.app_context():
+            populate(args.rows)
+
+            print(f'{args.rows} users, best of {args.repeat}')
+            print(f'{"path":32} {"time (ms)":>10} {"peak memory (MB)":>18}')
+            for label, fn in [
+                ('ORM User instances (.all())', orm_list),
+                ('UserSummary list', summary_list),
+                ('UserSummary stream (yield_per)', summary_stream),
+            ]:
+                seconds, peak = measure(fn, args.repeat)
+                print(f'{label:32} {seconds * 1000:10.1f} {peak / 1024 / 1024:18.1f}')
+
+
+if __name__ == '__main__':
+    main()
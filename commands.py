@@ -0,0 +1,188 @@
+"""
+CLI Commands
+============
+Custom `flask` commands registered on the application.
+
+Schema migrations come from Flask-Migrate (`flask --app run db ...`).
+This module adds the commands for online data backfills:
+    flask --app run backfill list
+    flask --app run backfill run <name> [--batch-size N] [--sleep S]
+    flask --app run backfill reset <name>
+for the static asset pipeline:
+    flask --app run assets build
+for organizations (tenants):
+    flask --app run orgs create <slug> --name NAME [--admin USERNAME --admin-email EMAIL]
+    flask --app run orgs list
+and for API tokens:
+    flask --app run tokens create <username> [--org SLUG] [--name NAME]
+    flask --app run tokens list <username> [--org SLUG]
+    flask --app run tokens revoke <token id>
+"""
+
+import re
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from api_tokens import issue_token, revoke_token
+from asset_pipeline import build_assets, output_folder
+from backfill import BACKFILLS, get_progress, run_backfill, reset_backfill
+from extensions import db
+from models.api_token import ApiToken
+from models.organization import Organization
+from models.user import User
+
+# Command group: flask backfill ...
+backfill_cli = AppGroup('backfill', help='Run online, chunked data backfills.')
+
+# Command group: flask assets ...
+assets_cli = AppGroup('assets', help='Build fingerprinted static assets.')
+
+# Command group: flask orgs ...
+orgs_cli = AppGroup('orgs', help='Manage organizations (tenants).')
+
+# Command group: flask tokens ...
+tokens_cli = AppGroup('tokens', help='Manage API tokens.')
+
+
+@backfill_cli.command('list')
+def list_backfills():
+    """List registered backfills and their progress."""
+    if not BACKFILLS:
+        click.echo('No backfills registered.')
+        return
+
+    for name, job in sorted(BACKFILLS.items()):
+        progress = get_progress(name)
+        status = 'complete' if progress.is_complete else f'at id {progress.last_id}'
+        click.echo(f'{name:30} {status:20} {job.description}')
+
+
+@backfill_cli.command('run')
+@click.argument('name')
+@click.option('--batch-size', type=click.IntRange(min=1), default=None,
+              help='Rows per chunk (default: BACKFILL_BATCH_SIZE).')
+@click.option('--sleep', type=click.FloatRange(min=0), default=None,
+              help='Seconds to pause between chunks (default: BACKFILL_SLEEP_SECONDS).')
+@click.option('--max-batches', type=click.IntRange(min=1), default=None,
+              help='Stop after this many chunks; run again to resume.')
+def run_backfill_command(name, batch_size, sleep, max_batches):
+    """Run or resume the backfill NAME."""
+    if name not in BACKFILLS:
+        raise click.BadParameter(f'Unknown backfill "{name}".', param_hint='NAME')
+
+    progress = run_backfill(name, batch_size=batch_size, sleep=sleep,
+                            max_batches=max_batches, echo=click.echo)
+
+    if progress.is_complete:
+        click.echo(f'{name}: complete, {progress.rows_updated} rows updated.')
+    else:
+        click.echo(f'{name}: paused at id {progress.last_id}; run again to resume.')
+
+
+@backfill_cli.command('reset')
+@click.argument('name')
+def reset_backfill_command(name):
+    """Forget the progress of NAME so it runs from the start."""
+    if name not in BACKFILLS:
+        raise click.BadParameter(f'Unknown backfill "{name}".', param_hint='NAME')
+
+    reset_backfill(name)
+    click.echo(f'{name}: progress reset.')
+
+
+@assets_cli.command('build')
+def build_assets_command():
+    """Bundle, fingerprint and precompress CSS/JS into static/dist."""
+    manifest = build_assets(current_app)
+    for name, path in sorted(manifest.items()):
+        click.echo(f'{name} -> {path}')
+    click.echo(f'Manifest written to {output_folder(current_app)}')
+
+
+# Slugs are typed on the login form, which lowercases them
+_SLUG_RE = re.compile(r'^[a-z0-9]+(?:-[a-z0-9]+)*$')
+
+
+@orgs_cli.command('create')
+@click.argument('slug')
+@click.option('--name', required=True, help='Display name of the organization.')
+@click.option('--admin', 'admin_username', default=None,
+              help='Also create an admin user with this username (password is prompted).')
+@click.option('--admin-email', default=None, help='Email of the admin user.')
+def create_org_command(slug, name, admin_username, admin_email):
+    """Create the organization SLUG, optionally with its first admin."""
+    if not _SLUG_RE.match(slug) or len(slug) > 80:
+        raise click.BadParameter('Use lowercase letters, digits and hyphens (max 80 characters).',
+                                 param_hint='SLUG')
+    if Organization.query.filter_by(slug=slug).first():
+        raise click.BadParameter(f'Organization "{slug}" already exists.', param_hint='SLUG')
+    if admin_username and not admin_email:
+        raise click.BadParameter('--admin-email is required with --admin.', param_hint='--admin-email')
+
+    org = Organization(name=name, slug=slug)
+    db.session.add(org)
+    if admin_username:
+        password = click.prompt('Admin password', hide_input=True, confirmation_prompt=True)
+        admin = User(organization=org, username=admin_username, email=admin_email, role='admin')
+        admin.set_password(password)
+        db.session.add(admin)
+    db.session.commit()
+
+    click.echo(f'Organization "{slug}" created (id {org.id}).')
+    if admin_username:
+        click.echo(f'Admin "{admin_username}" can log in with organization "{slug}".')
+
+
+@orgs_cli.command('list')
+def list_orgs_command():
+    """List organizations and their user counts."""
+    for org in Organization.query.order_by(Organization.slug):
+        count = org.users.execution_options(all_tenants=True).count()
+        click.echo(f'{org.id:6} {org.slug:30} {count:6} users  {org.name}')
+
+
+def _find_user(username, org_slug):
+    """Look up a user by organization slug and username, or fail the command."""
+    org = Organization.query.filter_by(slug=org_slug).first()
+    user = org and User.query.filter_by(org_id=org.id, username=username).first()
+    if not user:
+        raise click.BadParameter(f'No user "{username}" in organization "{org_slug}".',
+                                 param_hint='USERNAME')
+    return user
+
+
+@tokens_cli.command('create')
+@click.argument('username')
+@click.option('--org', 'org_slug', default=Organization.DEFAULT_SLUG, show_default=True,
+              help='Organization slug of the user.')
+@click.option('--name', default='api', show_default=True, help='Label for the token.')
+def create_token_command(username, org_slug, name):
+    """Issue a new API token for USERNAME."""
+    user = _find_user(username, org_slug)
+    token, plaintext = issue_token(user, name)
+    click.echo(f'Token {token.id} created for {user.username}. Store it now; it is not shown again:')
+    click.echo(plaintext)
+
+
+@tokens_cli.command('list')
+@click.argument('username')
+@click.option('--org', 'org_slug', default=Organization.DEFAULT_SLUG, show_default=True,
+              help='Organization slug of the user.')
+def list_tokens_command(username, org_slug):
+    """List API tokens of USERNAME."""
+    user = _find_user(username, org_slug)
+    for token in sorted(user.api_tokens, key=lambda t: t.id):
+        status = 'active' if token.is_active else f'revoked {token.revoked_at:%Y-%m-%d %H:%M}'
+        click.echo(f'{token.id:6} {token.name:30} {token.created_at:%Y-%m-%d %H:%M}  {status}')
+
+
+@tokens_cli.command('revoke')
+@click.argument('token_id', type=int)
+def revoke_token_command(token_id):
+    """Revoke the API token TOKEN_ID."""
+    token = db.session.get(ApiToken, token_id)
+    if token is None:
+        raise click.BadParameter(f'No token with id {token_id}.', param_hint='TOKEN_ID')
+
+    revoke_token(token)
+    click.echo(f'Token {token_id} revoked.')
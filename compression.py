@@ -0,0 +1,215 @@
+"""
+Response Compression & HTTP Caching
+===================================
+Flask extension that compresses responses and adds conditional-request
+support to rendered pages.
+
+- HTML pages get a weak ETag and a Cache-Control header, so a repeat
+  view with a matching If-None-Match returns 304 Not Modified.
+- Responses whose MIME type is in COMPRESS_MIMETYPES and whose body is
+  at least COMPRESS_MIN_SIZE bytes are compressed with Brotli (if the
+  `brotli` package is installed) or gzip, whichever the client accepts.
+  Images are not in the allow-list: uploads are already compressed.
+- Streamed responses (e.g. the admin user table) are compressed on the
+  fly, flushing after every chunk so the client still receives rows as
+  they are produced; they get no ETag since the body is not known up
+  front. With ADMIN_USERS_STREAMING on (the default), that includes
+  /admin/users, which therefore never answers 304.
+- File responses (send_file, static files) are left untouched, as is
+  anything that already has a Content-Encoding.
+
+Bytes before and after compression are counted in `Compress.stats`
+and reported, per worker, in the `/readyz` payload.
+"""
+
+import gzip
+import threading
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; fall back to gzip only
+    brotli = None
+
+
+class Compress:
+    """
+    Compression and ETag middleware.
+
+    Usage:
+        compress = Compress()
+        compress.init_app(app)
+    """
+
+    def __init__(self, app=None):
+        self.stats = {'responses': 0, 'bytes_in': 0, 'bytes_out': 0}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Register the after_request hook on `app`.
+
+        Args:
+            app: Flask application instance
+        """
+        app.extensions['compress'] = self
+        app.after_request(self.after_request)
+
+    @property
+    def bytes_saved(self):
+        """Total bytes saved by compression since startup."""
+        return self.stats['bytes_in'] - self.stats['bytes_out']
+
+    def snapshot(self):
+        """
+        Get a consistent copy of the counters.
+
+        Returns:
+            Dict with responses, bytes_in, bytes_out and bytes_saved
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+        return stats
+
+    def after_request(self, response):
+        """Add caching headers, answer conditional requests and compress."""
+        config = current_app.config
+
+        if response.direct_passthrough:
+            return response
+
+        if self._is_cacheable_page(response):
+            response.headers.setdefault('Cache-Control', config['HTML_CACHE_CONTROL'])
+            if not response.is_streamed:
+                response.add_etag(weak=True)
+                response.make_conditional(request)
+
+        if response.mimetype not in config['COMPRESS_MIMETYPES']:
+            return response
+
+        # The body depends on Accept-Encoding from here on
+        response.vary.add('Accept-Encoding')
+
+        if (
+            not config['COMPRESS_ENABLED']
+            or response.status_code != 200
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+
+        if response.is_streamed:
+            encoding = self._choose_encoding(config['COMPRESS_ALGORITHMS'])
+            if encoding is not None:
+                response.response = self._compress_stream(response.response, encoding, config)
+                response.headers['Content-Encoding'] = encoding
+                response.headers.pop('Content-Length', None)
+            return response
+
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+
+        encoding = self._choose_encoding(config['COMPRESS_ALGORITHMS'])
+        if encoding is None:
+            return response
+
+        compressed = self._compress(data, encoding, config)
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        self._record(len(data), len(compressed))
+        current_app.logger.debug(
+            'Compressed %s with %s: %d -> %d bytes',
+            request.path, encoding, len(data), len(compressed)
+        )
+        return response
+
+    @staticmethod
+    def _is_cacheable_page(response):
+        """Check if `response` is a successful rendered HTML page."""
+        return (
+            request.method in ('GET', 'HEAD')
+            and response.status_code == 200
+            and response.mimetype == 'text/html'
+        )
+
+    @staticmethod
+    def _choose_encoding(preferred):
+        """
+        Pick the first encoding in `preferred` that the client accepts.
+
+        Args:
+            preferred: Encodings in server preference order, e.g. ['br', 'gzip']
+
+        Returns:
+            Encoding name or None
+        """
+        for encoding in preferred:
+            if encoding == 'br' and brotli is None:
+                continue
+            if request.accept_encodings[encoding] > 0:
+                return encoding
+        return None
+
+    @staticmethod
+    def _compress(data, encoding, config):
+        """Compress `data` with `encoding` at the configured level."""
+        if encoding == 'br':
+            return brotli.compress(data, quality=config['COMPRESS_BR_LEVEL'])
+        return gzip.compress(data, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+    def _compress_stream(self, chunks, encoding, config):
+        """
+        Compress a streamed body chunk by chunk.
+
+        Each chunk is flushed (Z_SYNC_FLUSH / brotli flush) so compression
+        never holds back data the application already produced.
+
+        Args:
+            chunks: Iterable of str/bytes chunks
+            encoding: 'br' or 'gzip'
+            config: Application config
+
+        Yields:
+            Compressed bytes
+        """
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=config['COMPRESS_BR_LEVEL'])
+            compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+        else:
+            # wbits=31 selects the gzip container
+            compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+            compress = compressor.compress
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+            finish = compressor.flush
+
+        size_in = size_out = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                data = compress(chunk) + flush()
+                size_in += len(chunk)
+                size_out += len(data)
+                if data:
+                    yield data
+            data = finish()
+            size_out += len(data)
+            yield data
+            self._record(size_in, size_out)
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def _record(self, size_in, size_out):
+        """Update the bytes-saved counters."""
+        with self._lock:
+            self.stats['responses'] += 1
+            self.stats['bytes_in'] += size_in
+            self.stats['bytes_out'] += size_out
@@ -18,16 +18,82 @@ class Config:
     # Secret key for session management and CSRF protection
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     
+    # API tokens: HMAC key for stored token digests, and in-memory cache
+    API_TOKEN_SECRET = os.getenv('API_TOKEN_SECRET', SECRET_KEY)
+    API_TOKEN_CACHE_TTL = float(os.getenv('API_TOKEN_CACHE_TTL', 5))  # seconds a revoked token may still work per worker
+    API_TOKEN_CACHE_SIZE = int(os.getenv('API_TOKEN_CACHE_SIZE', 10000))  # entries
+    
+    # Logging (see logging_config.py)
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+    LOG_FILE = os.getenv('LOG_FILE')  # None logs to stderr
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # records buffered before dropping
+    LOG_DROP_WARNING_INTERVAL = int(os.getenv('LOG_DROP_WARNING_INTERVAL', 60))  # seconds between drop warnings
+    LOG_REQUESTS = os.getenv('LOG_REQUESTS', 'true').lower() == 'true'
+    LOG_SAMPLE_RATES = {  # endpoint -> fraction of access records kept
+        'auth.login': 0.1,
+        'health.liveness': 0.01,
+        'health.readiness': 0.01,
+    }
+    LOG_SLOW_REQUEST_MS = float(os.getenv('LOG_SLOW_REQUEST_MS', 1000))  # always logged above this
+    
     # Database configuration
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URI', 'sqlite:///app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Read replicas (comma-separated URIs); plain reads are routed to them
+    DATABASE_REPLICA_URIS = [uri.strip() for uri in os.getenv('DATABASE_REPLICA_URIS', '').split(',') if uri.strip()]
+    SQLALCHEMY_BINDS = {
+        f'replica_{index}': {'url': uri, 'pool_pre_ping': True}
+        for index, uri in enumerate(DATABASE_REPLICA_URIS)
+    }
+    # Seconds a failing replica is skipped before it is tried again
+    DATABASE_REPLICA_RETRY_SECONDS = float(os.getenv('DATABASE_REPLICA_RETRY_SECONDS', 30))
+    # Seconds a client keeps reading from the primary after it wrote something
+    DATABASE_REPLICA_STICKY_SECONDS = float(os.getenv('DATABASE_REPLICA_STICKY_SECONDS', 5))
+    
+    # Apply pending migrations when the app starts (off: run `flask db upgrade` on deploy)
+    DATABASE_AUTO_MIGRATE = os.getenv('DATABASE_AUTO_MIGRATE', 'false').lower() == 'true'
+    
+    # Online backfills: rows per chunk and pause between chunks (seconds)
+    BACKFILL_BATCH_SIZE = int(os.getenv('BACKFILL_BATCH_SIZE', 1000))
+    BACKFILL_SLEEP_SECONDS = float(os.getenv('BACKFILL_SLEEP_SECONDS', 0.1))
+    
     # Flask-WTF settings
     WTF_CSRF_ENABLED = False
 
     # File Upload Configuration
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'static/uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max limit
+    
+    # Response compression (see compression.py)
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_ALGORITHMS = ['br', 'gzip']  # Preference order; 'br' needs the brotli package
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip level 1-9
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))  # brotli quality 0-11
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))  # bytes
+    COMPRESS_MIMETYPES = [
+        'text/html', 'text/css', 'text/plain', 'text/csv', 'text/xml',
+        'application/json', 'application/javascript', 'image/svg+xml',
+    ]
+    
+    # Static asset pipeline (see asset_pipeline.py)
+    ASSETS_PRECOMPRESS = os.getenv('ASSETS_PRECOMPRESS', 'true').lower() == 'true'  # write .gz/.br siblings
+    ASSETS_MAX_AGE = 365 * 24 * 60 * 60  # fingerprinted files never change
+    ASSETS_AUTO_BUILD = os.getenv('ASSETS_AUTO_BUILD', 'false').lower() == 'true'  # build on first use (always in debug)
+    
+    # Stream the admin user table instead of rendering it in one piece
+    # (streamed pages get no ETag, so /admin/users then never returns 304)
+    ADMIN_USERS_STREAMING = os.getenv('ADMIN_USERS_STREAMING', 'true').lower() == 'true'
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 8 * 1024))  # characters per flush
+    
+    # Health checks and warmup (see controllers/health_controller.py and warmup.py)
+    WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'true').lower() == 'true'
+    WARMUP_DB_CONNECTIONS = int(os.getenv('WARMUP_DB_CONNECTIONS', 5))  # per engine, capped at pool size
+    READINESS_POOL_SATURATION = float(os.getenv('READINESS_POOL_SATURATION', 0.9))  # /readyz fails at this pool usage
+    
+    # Rendered pages are per-user: cache privately, revalidate with ETag
+    HTML_CACHE_CONTROL = 'private, no-cache'
 
 
 class DevelopmentConfig(Config):
@@ -8,3 +8,5 @@ Controllers contain the business logic for handling requests.
 from . import auth_controller
 from . import admin_controller
 from . import user_controller
+from . import api_controller
+from . import health_controller
@@ -4,29 +4,39 @@ Admin Controller
 Handles admin-only operations like user CRUD.
 """
 
-from flask import render_template, redirect, url_for, flash
+import csv
+import io
+from flask import (render_template, redirect, url_for, flash, get_flashed_messages, Response,
+                   stream_with_context, stream_template, current_app)
+from flask_login import current_user
+from sqlalchemy import func
 from forms.user_forms import UserCreateForm, UserEditForm
 from models.user import User
+from models.read_models import list_user_summaries, iter_user_summaries
 from extensions import db
-from helper import save_picture
+from helper import save_picture, buffer_stream
 
 
 def dashboard():
     """
     Admin dashboard.
     
-    Shows overview statistics and quick links.
+    Shows overview statistics for the current organization and quick links.
     
     Returns:
         Rendered dashboard template
     """
-    # Get counts for dashboard stats
-    total_users = User.query.count()
-    admin_count = User.query.filter_by(role='admin').count()
-    user_count = User.query.filter_by(role='user').count()
+    # Count users per role in one query (tenant-filtered, uses ix_users_org_role)
+    role_counts = dict(
+        db.session.query(User.role, func.count(User.id)).group_by(User.role).all()
+    )
+    admin_count = role_counts.get('admin', 0)
+    user_count = role_counts.get('user', 0)
+    total_users = sum(role_counts.values())
     
     return render_template(
         'admin/dashboard.html',
+        organization=current_user.organization,
         total_users=total_users,
         admin_count=admin_count,
         user_count=user_count
@@ -37,13 +47,62 @@ def list_users():
     """
     List all users.
     
+    Uses lightweight read-model rows instead of full User instances.
+    With ADMIN_USERS_STREAMING enabled, the page is streamed: the header
+    and first rows are sent right away and the remaining rows follow in
+    STREAM_CHUNK_SIZE chunks as they are read, so time-to-first-byte and
+    worker memory do not grow with the number of users.
+    
+    The session cookie is written before a streamed body renders, so
+    anything that changes the session (popping flash messages) happens
+    here, not in the template. Streamed pages also get no ETag.
+    
     Returns:
-        Rendered user list template
+        Rendered (or streamed) user list template
     """
-    users = User.query.order_by(User.created_at.desc()).all()
+    if current_app.config['ADMIN_USERS_STREAMING']:
+        fragments = stream_template('admin/users.html', users=iter_user_summaries(),
+                                    flashed_messages=get_flashed_messages(with_categories=True))
+        return Response(buffer_stream(fragments, current_app.config['STREAM_CHUNK_SIZE']),
+                        mimetype='text/html')
+    
+    users = list_user_summaries()
     return render_template('admin/users.html', users=users)
 
 
+def export_users():
+    """
+    Export all users as CSV.
+    
+    Rows are streamed from the database in batches, so memory use does
+    not grow with the number of users.
+    
+    Returns:
+        Streamed CSV response
+    """
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['id', 'username', 'email', 'role', 'created_at'])
+        
+        for count, user in enumerate(iter_user_summaries(), start=1):
+            writer.writerow([user.id, user.username, user.email, user.role,
+                             user.created_at.isoformat() if user.created_at else ''])
+            # Flush every 500 rows
+            if count % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield buffer.getvalue()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=users.csv'}
+    )
+
+
 def create_user():
     """
     Create a new user.
@@ -59,6 +118,7 @@ def create_user():
     if form.validate_on_submit():
         # Create new user
         user = User(
+            org_id=current_user.org_id,
             username=form.username.data,
             email=form.email.data,
             role=form.role.data
@@ -0,0 +1,89 @@
+"""
+API Controller
+==============
+Handles JSON endpoints for machine clients (authenticated with API tokens).
+"""
+
+from datetime import datetime
+from flask import jsonify, request
+from flask_login import current_user
+import api_tokens
+from models.api_token import ApiToken
+from models.read_models import user_summary_page
+from models.user import User
+
+# Page size limits for list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _encode_cursor(user):
+    """Encode the position after `user` as an opaque cursor string."""
+    return f'{user.created_at.isoformat()}_{user.id}'
+
+
+def _decode_cursor(cursor):
+    """
+    Decode a cursor produced by _encode_cursor.
+
+    Returns:
+        (created_at, id) tuple, or None if the cursor is invalid
+    """
+    created_at, _, user_id = cursor.rpartition('_')
+    try:
+        return datetime.fromisoformat(created_at), int(user_id)
+    except ValueError:
+        return None
+
+
+def list_users():
+    """
+    List users, newest first, one page at a time.
+
+    Query parameters:
+        limit: Page size (default 100, max 1000)
+        cursor: `next_cursor` from the previous page
+
+    Returns:
+        JSON with `users` and `next_cursor` (None on the last page)
+    """
+    limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        after = _decode_cursor(cursor)
+        if after is None:
+            return jsonify(error='Invalid cursor.'), 400
+
+    users = user_summary_page(limit, after=after)
+    next_cursor = _encode_cursor(users[-1]) if len(users) == limit else None
+
+    return jsonify(users=[user.to_dict() for user in users], next_cursor=next_cursor)
+
+
+def revoke_token(token_id):
+    """
+    Revoke an API token.
+
+    Allowed for the token's owner and for admins of the same
+    organization. Other workers may accept the token for up to
+    API_TOKEN_CACHE_TTL seconds more (see api_tokens.py).
+
+    Args:
+        token_id: ID of the token to revoke
+
+    Returns:
+        JSON with the token ID and revocation time
+    """
+    token = ApiToken.query.join(ApiToken.user).filter(
+        ApiToken.id == token_id, User.org_id == current_user.org_id
+    ).first()
+    if token is None:
+        return jsonify(error='Token not found.'), 404
+    if token.user_id != current_user.id and not current_user.is_admin:
+        return jsonify(error='Admin privileges required.'), 403
+
+    if token.is_active:
+        api_tokens.revoke_token(token)
+    return jsonify(id=token.id, revoked_at=token.revoked_at.isoformat())
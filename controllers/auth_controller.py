@@ -7,7 +7,9 @@ Handles user authentication logic (login, logout).
 from flask import render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, current_user
 from forms.auth_forms import LoginForm
+from models.organization import Organization
 from models.user import User
+from tenancy import tenant_scope
 
 
 def login():
@@ -29,8 +31,12 @@ def login():
     form = LoginForm()
     
     if form.validate_on_submit():
-        # Find user by username
-        user = User.query.filter_by(username=form.username.data).first()
+        # Find user by username within the chosen organization
+        org = Organization.query.filter_by(slug=form.organization.data.strip().lower()).first()
+        user = None
+        if org:
+            with tenant_scope(org.id):
+                user = User.query.filter_by(username=form.username.data).first()
         
         # Verify user exists and password is correct
         if user and user.check_password(form.password.data):
@@ -49,7 +55,7 @@ def login():
             return redirect(url_for('user.profile'))
         
         # Invalid credentials
-        flash('Invalid username or password. Please try again.', 'danger')
+        flash('Invalid organization, username or password. Please try again.', 'danger')
     
     return render_template('auth/login.html', form=form)
 
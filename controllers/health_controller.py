@@ -0,0 +1,181 @@
+"""
+Health Controller
+=================
+Handles the liveness and readiness probes used by the load balancer and
+process manager.
+
+- Liveness (`/healthz`) only proves the worker can answer a request; it
+  touches no database, so a database outage does not get every worker
+  restarted.
+- Readiness (`/readyz`) tells the load balancer whether to send traffic
+  to this worker. It returns 503 while warmup is still running or has
+  a failed step (retried on every probe), when the asset manifest
+  cannot be loaded (every page would fail), when the primary database
+  does not answer, or when the connection pool is nearly exhausted (so
+  traffic shifts to less busy workers). Failing replicas and an
+  unwritable upload folder only report "degraded": the app still serves
+  requests without them (reads fall back to the primary, only uploads
+  fail). The payload also carries this worker's runtime counters
+  (`stats`), which never affect the status.
+"""
+
+import logging
+import os
+import tempfile
+import time
+import sqlalchemy as sa
+from flask import current_app, jsonify
+from asset_pipeline import load_manifest
+from db_routing import REPLICA_BIND_PREFIX
+from extensions import db
+from warmup import WARMUP_KEY, retry_failed_steps
+
+logger = logging.getLogger(__name__)
+
+# Checks that make the worker unready when they fail
+CRITICAL_CHECKS = ('warmup', 'assets', 'database', 'pool')
+
+
+def _probe_response(payload, status_code):
+    """Build an uncacheable JSON probe response."""
+    response = jsonify(payload)
+    response.status_code = status_code
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+def _ping(engine):
+    """
+    Run `SELECT 1` on `engine`.
+
+    Returns:
+        Check result with latency, or the error name
+    """
+    started = time.perf_counter()
+    try:
+        with engine.connect() as connection:
+            connection.execute(sa.text('SELECT 1'))
+    except sa.exc.DBAPIError as exc:
+        logger.warning('Health check ping failed for %s', engine.url.render_as_string(), exc_info=True)
+        return {'ok': False, 'error': type(exc).__name__}
+    return {'ok': True, 'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+
+def _check_warmup(app):
+    """Check that warmup has finished (or is disabled) and every step succeeded."""
+    status = app.extensions.get(WARMUP_KEY)
+    if status is None:
+        return {'ok': not app.config['WARMUP_ON_START']}
+    if not status.ready:
+        return {'ok': False}
+
+    failed_steps = retry_failed_steps(app, status)
+    result = {'ok': not failed_steps, 'duration_ms': status.duration_ms}
+    if failed_steps:
+        result['failed_steps'] = failed_steps
+    return result
+
+
+def _check_assets(app):
+    """Check that the asset manifest every page links to can be loaded."""
+    try:
+        manifest = load_manifest(app)
+    except (OSError, ValueError, RuntimeError) as exc:
+        logger.warning('Asset manifest unavailable: %s', exc)
+        return {'ok': False, 'error': type(exc).__name__}
+    return {'ok': True, 'bundles': len(manifest)}
+
+
+def _check_pool(engine, threshold):
+    """
+    Check how much of the primary connection pool is in use.
+
+    Pools without a fixed size (e.g. SQLite in-memory or NullPool) are
+    always reported healthy.
+    """
+    pool = engine.pool
+    if not hasattr(pool, 'checkedout') or not hasattr(pool, 'size'):
+        return {'ok': True, 'pool': type(pool).__name__}
+
+    capacity = pool.size() + max(getattr(pool, '_max_overflow', 0), 0)
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        'ok': saturation < threshold,
+        'checked_out': checked_out,
+        'capacity': capacity,
+        'saturation': round(saturation, 2),
+    }
+
+
+def _check_replicas():
+    """Ping every replica; failures also take it out of rotation."""
+    results = {}
+    for key, engine in sorted(db.engines.items(), key=lambda item: str(item[0])):
+        if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX):
+            results[key] = _ping(engine)
+    return {'ok': all(r['ok'] for r in results.values()), 'replicas': results}
+
+
+def _check_upload_folder(folder):
+    """Check that profile pictures can be written to `folder`."""
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with tempfile.TemporaryFile(dir=folder):
+            pass
+    except OSError as exc:
+        logger.warning('Upload folder %s is not writable', folder, exc_info=True)
+        return {'ok': False, 'error': type(exc).__name__}
+    return {'ok': True}
+
+
+def _runtime_stats(app):
+    """Counters of this worker, reported alongside the checks."""
+    stats = {}
+    compress = app.extensions.get('compress')
+    if compress is not None:
+        stats['compression'] = compress.snapshot()
+    log_handler = app.extensions.get('logging')
+    if log_handler is not None:
+        stats['logging'] = {'dropped': log_handler.dropped}
+    return stats
+
+
+def liveness():
+    """
+    Report that the worker process is alive.
+
+    Returns:
+        200 JSON response
+    """
+    return _probe_response({'status': 'ok'}, 200)
+
+
+def readiness():
+    """
+    Report whether this worker should receive traffic.
+
+    Returns:
+        JSON with the overall `status` ('ready', 'degraded' or
+        'unavailable'), per-check details and runtime `stats`; 503 when
+        unavailable
+    """
+    app = current_app._get_current_object()
+    config = app.config
+
+    checks = {'warmup': _check_warmup(app), 'assets': _check_assets(app)}
+    # Measure saturation before the ping below checks out a connection itself
+    checks['pool'] = _check_pool(db.engine, config['READINESS_POOL_SATURATION'])
+    checks['database'] = _ping(db.engine)
+    checks['replicas'] = _check_replicas()
+    checks['uploads'] = _check_upload_folder(config['UPLOAD_FOLDER'])
+
+    if not all(checks[name]['ok'] for name in CRITICAL_CHECKS):
+        status, status_code = 'unavailable', 503
+    elif not all(check['ok'] for check in checks.values()):
+        status, status_code = 'degraded', 200
+    else:
+        status, status_code = 'ready', 200
+
+    return _probe_response({'status': status, 'checks': checks, 'stats': _runtime_stats(app)},
+                           status_code)
@@ -0,0 +1,237 @@
+"""
+Database Read/Write Routing
+===========================
+Routes read-only queries to replica databases and everything else to
+the primary.
+
+Replicas are configured with DATABASE_REPLICA_URIS (comma separated) and
+registered as SQLAlchemy binds named `replica_0`, `replica_1`, ...
+`RoutingSession` then picks an engine per statement:
+
+- Only GET and HEAD requests read from replicas. Other requests
+  (form posts that load, check and then change rows) and code running
+  outside a request (CLI commands, seeding) use the primary for
+  everything, so they never act on lagging data.
+- Writes, flushes and SELECT ... FOR UPDATE always use the primary.
+- Once a request has flushed a change, the rest of that request reads
+  from the primary too, and so do requests from the same browser for
+  DATABASE_REPLICA_STICKY_SECONDS afterwards (read-your-writes across
+  the usual POST -> redirect -> GET).
+- Other SELECTs go to the replicas in round-robin order. A replica that
+  raises a connection-level error is skipped for
+  DATABASE_REPLICA_RETRY_SECONDS, and the failed read is retried once
+  on the primary, so a broken replica never surfaces as an error. With
+  no healthy replica, reads fall back to the primary.
+- `use_primary()` forces the primary as a context manager or decorator.
+
+Local testing with two SQLite files:
+    cp instance/app.db instance/replica.db
+    DATABASE_REPLICA_URIS=sqlite:///replica.db python run.py
+"""
+
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import sqlalchemy as sa
+from flask import current_app, has_request_context, request, session as flask_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Prefix of the bind keys created for replicas in Config.SQLALCHEMY_BINDS
+REPLICA_BIND_PREFIX = 'replica_'
+
+# Session.info key set once the session has flushed a change
+WROTE_PRIMARY_KEY = 'wrote_primary'
+
+# Session.info key set when a statement was routed to a replica
+USED_REPLICA_KEY = 'used_replica'
+
+# Flask session key holding the time until which reads stick to the primary
+STICKY_SESSION_KEY = '_db_primary_until'
+
+# Request methods whose reads may be served by replicas
+REPLICA_METHODS = {'GET', 'HEAD'}
+
+# Depth of nested use_primary() blocks in the current context
+_force_primary = ContextVar('force_primary', default=0)
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def use_primary():
+    """
+    Force every query in the block to use the primary database.
+
+    Usage:
+        with use_primary():
+            user = User.query.get(user_id)
+
+        @use_primary()
+        def view():
+            ...
+    """
+    token = _force_primary.set(_force_primary.get() + 1)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+class ReplicaSelector:
+    """
+    Round-robin selection over healthy replica engines.
+
+    Attributes:
+        retry_after: Seconds a failing replica is skipped before retrying it
+    """
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def choose(self, engines):
+        """
+        Pick the next healthy replica engine.
+
+        Args:
+            engines: Mapping of bind key to engine (db.engines)
+
+        Returns:
+            Engine, or None if no replica is configured or healthy
+        """
+        now = time.monotonic()
+        healthy = [
+            key for key in sorted(engines, key=str)
+            if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)
+            and self._down_until.get(key, 0) <= now
+        ]
+        if not healthy:
+            return None
+        return engines[healthy[next(self._counter) % len(healthy)]]
+
+    def mark_down(self, key):
+        """Skip the replica `key` for `retry_after` seconds."""
+        with self._lock:
+            self._down_until[key] = time.monotonic() + self.retry_after
+
+    def status(self, engines):
+        """
+        Report the health of every replica.
+
+        Returns:
+            Dict of bind key -> True (healthy) / False (skipped)
+        """
+        now = time.monotonic()
+        return {
+            key: self._down_until.get(key, 0) <= now
+            for key in sorted(engines, key=str)
+            if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)
+        }
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends plain reads to replicas."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._can_use_replica(clause):
+            selector = current_app.extensions.get('db_routing')
+            if selector is not None:
+                engine = selector.choose(self._db.engines)
+                if engine is not None:
+                    self.info[USED_REPLICA_KEY] = True
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def execute(self, statement, *args, **kwargs):
+        return self._with_primary_fallback(super().execute, statement, *args, **kwargs)
+
+    def scalars(self, statement, *args, **kwargs):
+        return self._with_primary_fallback(super().scalars, statement, *args, **kwargs)
+
+    def scalar(self, statement, *args, **kwargs):
+        return self._with_primary_fallback(super().scalar, statement, *args, **kwargs)
+
+    def _with_primary_fallback(self, method, statement, *args, **kwargs):
+        """
+        Run `method`, retrying once on the primary if a replica fails.
+
+        Only connection-level errors (the ones that also take the replica
+        out of rotation) are retried. The session is rolled back first to
+        discard the broken replica connection; replica reads only happen
+        before a request has written anything, so no changes are lost.
+        """
+        self.info[USED_REPLICA_KEY] = False
+        try:
+            return method(statement, *args, **kwargs)
+        except sa.exc.DBAPIError as exc:
+            if not self.info.get(USED_REPLICA_KEY) or not _is_connection_error(exc):
+                raise
+            logger.warning('Replica read failed (%s); retrying on the primary', type(exc).__name__)
+            self.rollback()
+            with use_primary():
+                return method(statement, *args, **kwargs)
+
+    def _can_use_replica(self, clause):
+        """Check whether `clause` may be served by a replica."""
+        if not isinstance(clause, sa.Select) or clause._for_update_arg is not None:
+            return False
+        if self._flushing or self.info.get(WROTE_PRIMARY_KEY) or _force_primary.get():
+            return False
+        if not has_request_context() or request.method not in REPLICA_METHODS:
+            return False
+        if flask_session.get(STICKY_SESSION_KEY, 0) > time.time():
+            return False
+        return True
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _remember_write(session, flush_context):
+    """Pin the rest of the session to the primary after a write."""
+    session.info[WROTE_PRIMARY_KEY] = True
+
+
+def init_db_routing(app, db):
+    """
+    Set up replica selection and health tracking for `app`.
+
+    Must be called after db.init_app(app).
+
+    Args:
+        app: Flask application instance
+        db: Flask-SQLAlchemy extension using RoutingSession
+    """
+    selector = ReplicaSelector(app.config['DATABASE_REPLICA_RETRY_SECONDS'])
+    app.extensions['db_routing'] = selector
+
+    with app.app_context():
+        for key, engine in db.engines.items():
+            if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX):
+                event.listen(engine, 'handle_error', _replica_error_handler(selector, key))
+
+    @app.after_request
+    def stick_to_primary_after_write(response):
+        """Keep this client's reads on the primary for a short while after a write."""
+        sticky_seconds = app.config['DATABASE_REPLICA_STICKY_SECONDS']
+        if sticky_seconds and selector.status(db.engines) and db.session.info.get(WROTE_PRIMARY_KEY):
+            flask_session[STICKY_SESSION_KEY] = time.time() + sticky_seconds
+        return response
+
+
+def _is_connection_error(exc):
+    """Check whether `exc` means the database (rather than the query) failed."""
+    return exc.connection_invalidated or isinstance(exc, sa.exc.OperationalError)
+
+
+def _replica_error_handler(selector, key):
+    """Build a handle_error listener that marks replica `key` unhealthy."""
+    def handle_error(context):
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, sa.exc.OperationalError):
+            selector.mark_down(key)
+    return handle_error
@@ -8,9 +8,15 @@ This pattern prevents circular imports.
 
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from flask_migrate import Migrate
+from db_routing import RoutingSession
+from compression import Compress
 
-# Database ORM
-db = SQLAlchemy()
+# Database ORM (reads may be routed to replicas, see db_routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Schema migrations (Alembic)
+migrate = Migrate()
 
 # Login Manager for user sessions
 login_manager = LoginManager()
@@ -19,3 +25,6 @@ login_manager = LoginManager()
 login_manager.login_view = 'auth.login'  # Redirect to this view when login is required
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'warning'
+
+# Response compression and ETags for rendered pages
+compress = Compress()
@@ -14,10 +14,21 @@ class LoginForm(FlaskForm):
     Login Form
     
     Fields:
+        organization: Organization slug (required, defaults to 'default')
         username: User's username (required)
         password: User's password (required)
     """
     
+    organization = StringField(
+        'Organization',
+        default='default',
+        validators=[
+            DataRequired(message='Organization is required'),
+            Length(max=80, message='Organization must be less than 80 characters')
+        ],
+        render_kw={'placeholder': 'Enter your organization', 'class': 'form-control'}
+    )
+    
     username = StringField(
         'Username',
         validators=[
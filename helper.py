@@ -5,10 +5,36 @@ Contains helper functions like database seeding.
 """
 
 from extensions import db
+from models.organization import Organization
 from models.user import User
+import logging
 import os
 import secrets
+import sqlalchemy as sa
+from contextlib import contextmanager
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from flask import current_app
+from flask_migrate import stamp, upgrade
+
+try:
+    import fcntl
+except ImportError:  # Windows: no file locking (single dev process)
+    fcntl = None
+
+# First migration: matches the schema that db.create_all() used to build
+BASELINE_REVISION = '0001_initial'
+
+# Name of the lock serializing startup migrations and seeding
+STARTUP_LOCK_NAME = 'flask_demo_startup'
+
+# pg_advisory_lock key for STARTUP_LOCK_NAME (any constant 64-bit integer)
+STARTUP_LOCK_KEY = 7461029384
+
+# Seconds MySQL waits for the startup lock
+STARTUP_LOCK_TIMEOUT = 300
+
+logger = logging.getLogger(__name__)
 
 
 def save_picture(form_picture):
@@ -33,24 +59,152 @@ def save_picture(form_picture):
     return picture_fn
 
 
+def buffer_stream(fragments, chunk_size):
+    """
+    Group small streamed fragments into chunks of about `chunk_size` bytes.
+    
+    Jinja's template streaming yields many tiny strings (one per template
+    node); sending each as its own write wastes syscalls and, when
+    compressed, compression ratio.
+    
+    Args:
+        fragments: Iterable of str fragments (e.g. from stream_template)
+        chunk_size: Minimum characters per emitted chunk
+        
+    Yields:
+        str chunks; the remainder is emitted at the end
+    """
+    buffer = []
+    size = 0
+    for fragment in fragments:
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+@contextmanager
+def startup_lock():
+    """
+    Hold a cross-process lock while migrating or seeding at startup.
+    
+    Uses an advisory lock on PostgreSQL and MySQL, so workers on
+    different hosts wait for each other too, and a lock file in the
+    instance folder otherwise (SQLite). Must be called inside an
+    application context.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        with db.engine.connect() as connection:
+            connection.execute(sa.text('SELECT pg_advisory_lock(:key)'), {'key': STARTUP_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(sa.text('SELECT pg_advisory_unlock(:key)'), {'key': STARTUP_LOCK_KEY})
+    elif dialect in ('mysql', 'mariadb'):
+        with db.engine.connect() as connection:
+            acquired = connection.execute(sa.text('SELECT GET_LOCK(:name, :timeout)'),
+                                          {'name': STARTUP_LOCK_NAME, 'timeout': STARTUP_LOCK_TIMEOUT}).scalar()
+            if acquired != 1:
+                raise RuntimeError(f'Timed out waiting for the "{STARTUP_LOCK_NAME}" lock.')
+            try:
+                yield
+            finally:
+                connection.execute(sa.text('SELECT RELEASE_LOCK(:name)'), {'name': STARTUP_LOCK_NAME})
+    elif fcntl is not None:
+        os.makedirs(current_app.instance_path, exist_ok=True)
+        with open(os.path.join(current_app.instance_path, 'startup.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        yield
+
+
+def schema_is_current():
+    """
+    Check whether the database is at the latest migration.
+    
+    Must be called inside an application context.
+    
+    Returns:
+        True if every migration head has been applied
+    """
+    config = current_app.extensions['migrate'].migrate.get_config()
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with db.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return current == heads
+
+
+def stamp_legacy_database():
+    """
+    Stamp databases created before migrations existed.
+    
+    Such databases (built via db.create_all()) have a `users` table but
+    no `alembic_version` table; they are stamped with the baseline
+    revision so only newer migrations run. Must be called inside an
+    application context.
+    """
+    tables = sa.inspect(db.engine).get_table_names()
+    if 'users' in tables and 'alembic_version' not in tables:
+        stamp(revision=BASELINE_REVISION)
+
+
+def upgrade_database():
+    """
+    Bring the database schema up to the latest migration.
+    
+    Must be called inside an application context.
+    """
+    stamp_legacy_database()
+    upgrade()
+
+
 def seed_database(app):
     """
     Seed the database with initial admin user.
-    This runs only if no users exist in the database.
+    This runs only if no users exist in the default organization.
+    
+    Migrations are applied first only when DATABASE_AUTO_MIGRATE is set;
+    otherwise run `flask --app run db upgrade` as a deploy step. Seeding
+    is skipped while the schema is behind the latest migration. Workers
+    starting at the same time take turns through `startup_lock()`.
     
     Args:
         app: Flask application instance
     """
-    with app.app_context():
-        # Create tables if they don't exist
-        db.create_all()
+    with app.app_context(), startup_lock():
+        if app.config['DATABASE_AUTO_MIGRATE']:
+            upgrade_database()
+        else:
+            stamp_legacy_database()
+        
+        if not schema_is_current():
+            logger.warning('Database schema is not up to date; skipping seeding. '
+                           'Run "flask --app run db upgrade".')
+            return
+        
+        # Make sure the default organization exists
+        org = Organization.query.filter_by(slug=Organization.DEFAULT_SLUG).first()
+        if not org:
+            org = Organization(name='Default Organization', slug=Organization.DEFAULT_SLUG)
+            db.session.add(org)
+            db.session.commit()
         
         # Check if admin user already exists
-        admin = User.query.filter_by(username='admin').first()
+        admin = User.query.filter_by(org_id=org.id, username='admin').first()
         
         if not admin:
             # Create default admin user
             admin = User(
+                organization=org,
                 username='admin',
                 email='admin@example.com',
                 role='admin'
@@ -60,6 +214,7 @@ def seed_database(app):
             
             # Create a sample regular user
             user = User(
+                organization=org,
                 username='user',
                 email='user@example.com',
                 role='user'
@@ -68,6 +223,5 @@ def seed_database(app):
             db.session.add(user)
             
             db.session.commit()
-            print('Database seeded with default users:')
-            print('  Admin: username=admin, password=admin123')
-            print('  User:  username=user, password=user123')
+            logger.info('Database seeded with default users: admin/admin123 and user/user123 '
+                        'in organization "%s"', org.slug)
@@ -0,0 +1,257 @@
+"""
+Logging Configuration
+=====================
+Structured, non-blocking logging configured from `Config`.
+
+- Records are formatted as one JSON object per line (LOG_FORMAT='json')
+  or as plain text (LOG_FORMAT='text').
+- Request threads only put records on a bounded queue
+  (`BoundedQueueHandler`); a `QueueListener` thread does the formatting
+  and disk/console I/O. When the queue is full, records are dropped and
+  counted instead of blocking the request; once the queue has room again
+  a warning record reports how many were lost (at most once every
+  LOG_DROP_WARNING_INTERVAL seconds), and `/readyz` shows the total.
+- Records emitted during a request carry `request_id`, `user_id` and
+  `endpoint`. One access record per request adds `method`, `path`,
+  `status` and `latency_ms`; it is written when the response is closed,
+  so streamed responses report their full duration.
+- Access records for high-volume endpoints are sampled with
+  LOG_SAMPLE_RATES; errors and slow requests are always logged.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+# Header used to propagate / return the request ID
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Logger receiving one access record per request
+access_logger = logging.getLogger('app.access')
+
+# Logger of the warnings about dropped records
+logger = logging.getLogger(__name__)
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach request_id, user_id and endpoint to records emitted in a request."""
+
+    def filter(self, record):
+        if has_request_context() and not hasattr(record, 'request_id'):
+            record.request_id = g.get('request_id')
+            record.user_id = _loaded_user_id()
+            record.endpoint = request.endpoint
+        return True
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops (and counts) records when its queue is full.
+
+    Drops are reported with a warning record, queued behind the next
+    record that fits, at most once every `warning_interval` seconds.
+
+    Attributes:
+        dropped: Number of records dropped since startup
+    """
+
+    def __init__(self, maxsize, warning_interval=60):
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.dropped = 0
+        self.warning_interval = warning_interval
+        self._reported = 0
+        self._last_warning = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        if self.dropped > self._reported:
+            self._warn_dropped()
+
+    def _warn_dropped(self):
+        """Queue a warning about the records dropped since the last one."""
+        now = time.monotonic()
+        with self._lock:
+            if self._last_warning is not None and now - self._last_warning < self.warning_interval:
+                return
+            lost = self.dropped - self._reported
+            self._reported = self.dropped
+            self._last_warning = now
+
+        warning = logger.makeRecord(
+            logger.name, logging.WARNING, __file__, 0,
+            '%s log records dropped (queue full)', (lost,), None,
+            extra={'dropped': lost, 'dropped_total': self._reported},
+        )
+        try:
+            self.queue.put_nowait(self.prepare(warning))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def prepare(self, record):
+        """
+        Make the record safe to hand to another thread.
+
+        Unlike the base class, keep it structured: merge args into the
+        message and render the traceback into exc_text, but leave the
+        formatting itself to the listener's handlers.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _loaded_user_id():
+    """ID of the user Flask-Login already loaded for this request, if any."""
+    user = g.get('_login_user')
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return None
+    return user.get_id()
+
+
+def _build_output_handler(config):
+    """Create the handler that performs the actual I/O."""
+    if config['LOG_FILE']:
+        handler = logging.FileHandler(config['LOG_FILE'], encoding='utf-8')
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+
+    if config['LOG_FORMAT'] == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+        ))
+    return handler
+
+
+def configure_logging(app):
+    """
+    Route all logging through a bounded queue and a background listener.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        BoundedQueueHandler installed on the root logger
+    """
+    config = app.config
+
+    queue_handler = BoundedQueueHandler(config['LOG_QUEUE_SIZE'],
+                                        config['LOG_DROP_WARNING_INTERVAL'])
+    queue_handler.addFilter(RequestContextFilter())
+    listener = QueueListener(queue_handler.queue, _build_output_handler(config),
+                             respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(config['LOG_LEVEL'])
+
+    # Let app.logger propagate to the root queue instead of writing directly,
+    # at LOG_LEVEL rather than the DEBUG level Flask gives it in debug mode
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(config['LOG_LEVEL'])
+
+    listener.start()
+    atexit.register(_stop_listener, listener, queue_handler)
+
+    app.extensions['logging'] = queue_handler
+    if config['LOG_REQUESTS']:
+        _register_request_logging(app)
+    return queue_handler
+
+
+def _stop_listener(listener, queue_handler):
+    """Flush queued records at shutdown and report drops not yet warned about."""
+    listener.stop()
+    if queue_handler.dropped > queue_handler._reported:
+        sys.stderr.write(f'logging: {queue_handler.dropped} records dropped (queue full)\n')
+
+
+def _register_request_logging(app):
+    """Assign request IDs and write one access record per request."""
+
+    @app.before_request
+    def start_request_timer():
+        """Record the request ID and start time."""
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = incoming if 0 < len(incoming) <= 128 else uuid.uuid4().hex
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        """Schedule the access record for when the response is closed."""
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers[REQUEST_ID_HEADER] = request_id
+
+        started = g.get('request_start')
+        if started is None:
+            return response
+
+        fields = {
+            'request_id': request_id,
+            'user_id': _loaded_user_id(),
+            'endpoint': request.endpoint,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+        }
+        sample_rate = app.config['LOG_SAMPLE_RATES'].get(request.endpoint, 1.0)
+        slow_ms = app.config['LOG_SLOW_REQUEST_MS']
+
+        def write_access_record():
+            fields['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            always = fields['status'] >= 500 or fields['latency_ms'] >= slow_ms
+            if always or random.random() < sample_rate:
+                if sample_rate < 1.0:
+                    fields['sample_rate'] = sample_rate
+                access_logger.info('%s %s %s', fields['method'], fields['path'], fields['status'],
+                                   extra=fields)
+
+        response.call_on_close(write_access_record)
+        return response
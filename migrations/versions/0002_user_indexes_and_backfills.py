@@ -0,0 +1,35 @@
+"""Add backfill progress table
+
+The user listing indexes are created by 0003_organizations, with a
+leading org_id column.
+
+Revision ID: 0002_user_indexes
+Revises: 0001_initial
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_user_indexes'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('backfill_progress',
+    sa.Column('name', sa.String(length=80), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.Column('rows_updated', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('backfill_progress')
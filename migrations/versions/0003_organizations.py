@@ -0,0 +1,154 @@
+"""Add organizations and partition users by organization
+
+Existing users are assigned to a 'default' organization through the
+column's server default, which PostgreSQL 11+ and MySQL 8 apply without
+rewriting the table. The default is dropped again afterwards, so a new
+row that forgets org_id fails instead of landing in that organization. Global username/email uniqueness is replaced by
+per-organization uniqueness, and the listing indexes gain a leading
+org_id column.
+
+On PostgreSQL, where batch mode alters the table in place, the unique
+indexes are built CONCURRENTLY and then attached as constraints, and
+the foreign key is added NOT VALID and validated separately, so writes
+to users are only blocked for brief catalog updates. On MySQL every
+step is in-place online DDL; the foreign key is added with
+foreign_key_checks off, since with checks on MySQL copies the whole
+table (every row already references the default organization).
+
+Revision ID: 0003_organizations
+Revises: 0002_user_indexes
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_organizations'
+down_revision = '0002_user_indexes'
+branch_labels = None
+depends_on = None
+
+DEFAULT_ORG_ID = 1
+
+# Indexes replaced by their per-organization counterparts
+OLD_INDEXES = ('ix_users_username', 'ix_users_email')
+
+
+def upgrade():
+    organizations = op.create_table('organizations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=120), nullable=False),
+    sa.Column('slug', sa.String(length=80), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('organizations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_organizations_slug'), ['slug'], unique=True)
+
+    op.bulk_insert(organizations, [{
+        'id': DEFAULT_ORG_ID,
+        'name': 'Default Organization',
+        'slug': 'default',
+        'created_at': datetime.utcnow(),
+    }])
+    org_id = sa.Column('org_id', sa.Integer(), nullable=False, server_default=str(DEFAULT_ORG_ID))
+
+    dialect = op.get_context().dialect.name
+    if dialect == 'postgresql':
+        # An explicit id does not advance the serial sequence
+        op.execute("SELECT setval(pg_get_serial_sequence('organizations', 'id'), "
+                   "(SELECT max(id) FROM organizations))")
+        _upgrade_users_postgresql(org_id)
+        return
+    if dialect in ('mysql', 'mariadb'):
+        _upgrade_users_mysql(org_id)
+        return
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(org_id)
+        batch_op.create_foreign_key('fk_users_org_id_organizations', 'organizations', ['org_id'], ['id'])
+        for name in OLD_INDEXES:
+            batch_op.drop_index(name)
+        batch_op.create_unique_constraint('uq_users_org_username', ['org_id', 'username'])
+        batch_op.create_unique_constraint('uq_users_org_email', ['org_id', 'email'])
+
+    # Separate batch: the table copy above needs the default to fill org_id
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('org_id', existing_type=sa.Integer(), existing_nullable=False,
+                              server_default=None)
+
+    op.create_index('ix_users_org_role', 'users', ['org_id', 'role'])
+    op.create_index('ix_users_org_created_at_id', 'users', ['org_id', 'created_at', 'id'])
+
+
+def _upgrade_users_mysql(org_id):
+    """Partition users on MySQL with in-place (online) DDL."""
+    op.add_column('users', org_id)
+    op.alter_column('users', 'org_id', existing_type=sa.Integer(), existing_nullable=False,
+                    server_default=None)
+
+    # Created first so the foreign key reuses it instead of adding its own index
+    op.create_unique_constraint('uq_users_org_username', 'users', ['org_id', 'username'])
+    op.create_unique_constraint('uq_users_org_email', 'users', ['org_id', 'email'])
+
+    op.execute('SET foreign_key_checks = 0')
+    op.create_foreign_key('fk_users_org_id_organizations', 'users', 'organizations',
+                          ['org_id'], ['id'])
+    op.execute('SET foreign_key_checks = 1')
+    for name in OLD_INDEXES:
+        op.drop_index(name, table_name='users')
+    op.create_index('ix_users_org_role', 'users', ['org_id', 'role'])
+    op.create_index('ix_users_org_created_at_id', 'users', ['org_id', 'created_at', 'id'])
+
+
+def _upgrade_users_postgresql(org_id):
+    """Partition users on PostgreSQL without long table locks."""
+    op.add_column('users', org_id)
+    op.alter_column('users', 'org_id', server_default=None)
+    op.execute('ALTER TABLE users ADD CONSTRAINT fk_users_org_id_organizations '
+               'FOREIGN KEY (org_id) REFERENCES organizations (id) NOT VALID')
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index('uq_users_org_username', 'users', ['org_id', 'username'],
+                        unique=True, postgresql_concurrently=True)
+        op.create_index('uq_users_org_email', 'users', ['org_id', 'email'],
+                        unique=True, postgresql_concurrently=True)
+        op.create_index('ix_users_org_role', 'users', ['org_id', 'role'],
+                        postgresql_concurrently=True)
+        op.create_index('ix_users_org_created_at_id', 'users', ['org_id', 'created_at', 'id'],
+                        postgresql_concurrently=True)
+
+    op.execute('ALTER TABLE users ADD CONSTRAINT uq_users_org_username '
+               'UNIQUE USING INDEX uq_users_org_username')
+    op.execute('ALTER TABLE users ADD CONSTRAINT uq_users_org_email '
+               'UNIQUE USING INDEX uq_users_org_email')
+
+    with op.get_context().autocommit_block():
+        # Scans users under a lock that lets reads and writes continue; runs
+        # outside the transaction above so its stronger locks are released
+        op.execute('ALTER TABLE users VALIDATE CONSTRAINT fk_users_org_id_organizations')
+        for name in OLD_INDEXES:
+            op.drop_index(name, table_name='users', postgresql_concurrently=True)
+
+
+def downgrade():
+    op.drop_index('ix_users_org_created_at_id', table_name='users')
+    op.drop_index('ix_users_org_role', table_name='users')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_users_org_email', type_='unique')
+        batch_op.drop_constraint('uq_users_org_username', type_='unique')
+        batch_op.create_index('ix_users_email', ['email'], unique=True)
+        batch_op.create_index('ix_users_username', ['username'], unique=True)
+        batch_op.drop_constraint('fk_users_org_id_organizations', type_='foreignkey')
+        batch_op.drop_column('org_id')
+
+    with op.batch_alter_table('organizations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_organizations_slug'))
+
+    op.drop_table('organizations')
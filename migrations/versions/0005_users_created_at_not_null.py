@@ -0,0 +1,49 @@
+"""Make users.created_at NOT NULL
+
+Listings and API cursors order users by (created_at, id), which does not
+work for NULL timestamps. The application always sets created_at, so
+normally no rows need fixing; any that do get their updated_at (or the
+current time) first.
+
+On PostgreSQL the column is first covered by a NOT VALID check that is
+validated separately, which lets SET NOT NULL (PostgreSQL 12+) skip its
+own full-table scan under an exclusive lock.
+
+Revision ID: 0005_users_created_at_not_null
+Revises: 0004_api_tokens
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_users_created_at_not_null'
+down_revision = '0004_api_tokens'
+branch_labels = None
+depends_on = None
+
+CHECK_NAME = 'ck_users_created_at_not_null'
+
+
+def upgrade():
+    op.execute('UPDATE users SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) '
+               'WHERE created_at IS NULL')
+
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute(f'ALTER TABLE users ADD CONSTRAINT {CHECK_NAME} '
+                   'CHECK (created_at IS NOT NULL) NOT VALID')
+        with op.get_context().autocommit_block():
+            op.execute(f'ALTER TABLE users VALIDATE CONSTRAINT {CHECK_NAME}')
+        op.alter_column('users', 'created_at', existing_type=sa.DateTime(), nullable=False)
+        op.drop_constraint(CHECK_NAME, 'users', type_='check')
+        return
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
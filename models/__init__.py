@@ -4,6 +4,10 @@ Models Package
 This package contains all database models.
 """
 
+from .organization import Organization
 from .user import User
+from .api_token import ApiToken
+from .backfill import BackfillProgress
+from .read_models import UserSummary
 
-__all__ = ['User']
+__all__ = ['Organization', 'User', 'ApiToken', 'BackfillProgress', 'UserSummary']
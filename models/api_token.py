@@ -0,0 +1,44 @@
+"""
+API Token Model
+===============
+This module defines per-user API tokens for machine clients.
+"""
+
+from datetime import datetime
+from extensions import db
+
+
+class ApiToken(db.Model):
+    """
+    API Token Model
+    
+    Only a keyed hash of the token secret is stored (see api_tokens.py);
+    the plaintext token is shown once when it is issued.
+    
+    Attributes:
+        id: Primary key (embedded in the token so lookups hit the primary key)
+        user_id: Owner of the token
+        name: Label to tell tokens apart (e.g. 'deploy script')
+        token_hash: HMAC-SHA256 hex digest of the token secret
+        created_at: Timestamp when token was issued
+        revoked_at: Timestamp when token was revoked (None while active)
+    """
+    
+    __tablename__ = 'api_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    name = db.Column(db.String(80), nullable=False)
+    token_hash = db.Column(db.String(64), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+    
+    user = db.relationship('User', back_populates='api_tokens')
+    
+    @property
+    def is_active(self):
+        """Check if token has not been revoked."""
+        return self.revoked_at is None
+    
+    def __repr__(self):
+        return f'<ApiToken {self.id} {self.name}>'
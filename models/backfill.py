@@ -0,0 +1,40 @@
+"""
+Backfill Progress Model
+=======================
+This module tracks how far each online data backfill has progressed,
+so an interrupted backfill can resume where it stopped.
+"""
+
+from datetime import datetime
+from extensions import db
+
+
+class BackfillProgress(db.Model):
+    """
+    Backfill Progress Model
+    
+    Attributes:
+        name: Registered backfill name (primary key)
+        last_id: Highest primary key already processed
+        rows_updated: Total rows changed so far
+        started_at: Timestamp of the first processed chunk
+        updated_at: Timestamp of the last processed chunk
+        completed_at: Timestamp when the backfill finished (None while running)
+    """
+    
+    __tablename__ = 'backfill_progress'
+    
+    name = db.Column(db.String(80), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    rows_updated = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    
+    @property
+    def is_complete(self):
+        """Check if the backfill has finished."""
+        return self.completed_at is not None
+    
+    def __repr__(self):
+        return f'<BackfillProgress {self.name} last_id={self.last_id}>'
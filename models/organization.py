@@ -0,0 +1,37 @@
+"""
+Organization Model
+==================
+This module defines the Organization model used to partition users by
+customer (tenant).
+"""
+
+from datetime import datetime
+from extensions import db
+
+
+class Organization(db.Model):
+    """
+    Organization Model
+
+    Attributes:
+        id: Primary key
+        name: Display name
+        slug: Unique short name entered on the login form
+        created_at: Timestamp when organization was created
+        users: Users belonging to this organization
+    """
+
+    __tablename__ = 'organizations'
+
+    # Organization used for existing data and the seeded demo users
+    DEFAULT_SLUG = 'default'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    slug = db.Column(db.String(80), unique=True, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    users = db.relationship('User', back_populates='organization', lazy='dynamic')
+
+    def __repr__(self):
+        return f'<Organization {self.slug}>'
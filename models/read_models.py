@@ -0,0 +1,120 @@
+"""
+Read Models
+===========
+Lightweight, read-only views of users for listing, export and API
+output.
+
+Loading full `User` instances for a table costs an identity-map entry,
+change-tracking state and the unused `password_hash` per row. The
+helpers here select only the listed columns into `UserSummary` objects
+(plain `__slots__` classes, not tracked by the session), either all at
+once or streamed in batches with `yield_per` for exports.
+
+Queries go through the ORM, so tenant filtering and replica routing
+apply as usual.
+"""
+
+from sqlalchemy import select, tuple_
+from extensions import db
+from models.user import User
+
+# Columns needed by the user list, export and API
+USER_SUMMARY_COLUMNS = (User.id, User.username, User.email, User.role, User.created_at)
+
+
+class UserSummary:
+    """
+    Read-only user row.
+
+    Attributes:
+        id: User ID
+        username: Username
+        email: Email address
+        role: 'admin' or 'user'
+        created_at: Creation timestamp
+    """
+
+    __slots__ = ('id', 'username', 'email', 'role', 'created_at')
+
+    def __init__(self, id, username, email, role, created_at):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.role = role
+        self.created_at = created_at
+
+    @property
+    def is_admin(self):
+        """Check if user has admin role."""
+        return self.role == 'admin'
+
+    def to_dict(self):
+        """Serialize for JSON output."""
+        return {
+            'id': self.id,
+            'username': self.username,
+            'email': self.email,
+            'role': self.role,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+
+    def __repr__(self):
+        return f'<UserSummary {self.username}>'
+
+
+def user_summary_query():
+    """
+    Newest-first SELECT of the summary columns.
+
+    Ordered by (created_at, id) descending to use ix_users_org_created_at_id.
+
+    Returns:
+        SQLAlchemy Select
+    """
+    return select(*USER_SUMMARY_COLUMNS).order_by(User.created_at.desc(), User.id.desc())
+
+
+def list_user_summaries():
+    """
+    Load all users as summaries.
+
+    Returns:
+        List of UserSummary
+    """
+    return [UserSummary(*row) for row in db.session.execute(user_summary_query())]
+
+
+def iter_user_summaries(batch_size=1000):
+    """
+    Stream users as summaries, fetching `batch_size` rows at a time.
+
+    Memory stays bounded by the batch size regardless of table size.
+    The database cursor stays open until the generator is exhausted.
+
+    Args:
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        UserSummary
+    """
+    result = db.session.execute(user_summary_query().execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        for row in partition:
+            yield UserSummary(*row)
+
+
+def user_summary_page(limit, after=None):
+    """
+    Load one page of users using keyset pagination.
+
+    Args:
+        limit: Maximum number of rows
+        after: (created_at, id) of the last row of the previous page
+
+    Returns:
+        List of UserSummary
+    """
+    query = user_summary_query().limit(limit)
+    if after is not None:
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(*after))
+    return [UserSummary(*row) for row in db.session.execute(query)]
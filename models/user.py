@@ -8,16 +8,18 @@ from datetime import datetime
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from extensions import db
+from tenancy import TenantScoped
 
 
-class User(UserMixin, db.Model):
+class User(TenantScoped, UserMixin, db.Model):
     """
     User Model
     
     Attributes:
         id: Primary key
-        username: Unique username for login
-        email: User's email address
+        org_id: Organization (tenant) the user belongs to
+        username: Username for login, unique within the organization
+        email: User's email address, unique within the organization
         password_hash: Hashed password (never store plain passwords!)
         role: User role ('admin' or 'user')
         created_at: Timestamp when user was created
@@ -25,13 +27,25 @@ class User(UserMixin, db.Model):
     """
     
     __tablename__ = 'users'
+    __table_args__ = (
+        # Uniqueness is per organization; these also serve login lookups
+        db.UniqueConstraint('org_id', 'username', name='uq_users_org_username'),
+        db.UniqueConstraint('org_id', 'email', name='uq_users_org_email'),
+        # Tenant-leading indexes keep per-organization queries independent
+        # of how large other organizations grow
+        db.Index('ix_users_org_role', 'org_id', 'role'),
+        db.Index('ix_users_org_created_at_id', 'org_id', 'created_at', 'id'),
+    )
     
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
     
+    # Tenant (org_id column comes from TenantScoped)
+    organization = db.relationship('Organization', back_populates='users')
+    
     # User credentials
-    username = db.Column(db.String(80), unique=True, nullable=False, index=True)
-    email = db.Column(db.String(120), unique=True, nullable=False, index=True)
+    username = db.Column(db.String(80), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
     
     # Role: 'admin' or 'user'
@@ -41,9 +55,12 @@ class User(UserMixin, db.Model):
     profile_image = db.Column(db.String(120), nullable=True, default='default.jpg')
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # API tokens (deleted together with the user)
+    api_tokens = db.relationship('ApiToken', back_populates='user', cascade='all, delete-orphan')
+    
     def set_password(self, password):
         """
         Hash and set the user's password.
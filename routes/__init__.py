@@ -8,5 +8,7 @@ Routes define URL endpoints and connect them to controllers.
 from .auth_routes import auth_bp
 from .admin_routes import admin_bp
 from .user_routes import user_bp
+from .api_routes import api_bp
+from .health_routes import health_bp
 
-__all__ = ['auth_bp', 'admin_bp', 'user_bp']
+__all__ = ['auth_bp', 'admin_bp', 'user_bp', 'api_bp', 'health_bp']
@@ -53,6 +53,15 @@ def users():
     return admin_controller.list_users()
 
 
+# Export users as CSV
+@admin_bp.route('/users/export.csv')
+@login_required
+@admin_required
+def export_users():
+    """Download all users as CSV."""
+    return admin_controller.export_users()
+
+
 # Create new user
 @admin_bp.route('/users/create', methods=['GET', 'POST'])
 @login_required
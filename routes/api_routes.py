@@ -0,0 +1,61 @@
+"""
+API Routes
+==========
+URL routes for the JSON API.
+Clients authenticate with `Authorization: Bearer <token>` (see api_tokens.py).
+"""
+
+from functools import wraps
+from flask import Blueprint, jsonify
+from flask_login import current_user
+from controllers import api_controller
+
+# Create blueprint
+api_bp = Blueprint('api', __name__)
+
+
+def api_login_required(f):
+    """
+    Decorator to require an authenticated user on API routes.
+    
+    Returns a JSON 401 instead of redirecting to the login page.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify(error='Authentication required.'), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def api_admin_required(f):
+    """
+    Decorator to require an authenticated admin on API routes.
+    
+    Unlike login_required/admin_required, failures return JSON errors
+    (401/403) instead of redirecting to the login page.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify(error='Authentication required.'), 401
+        if not current_user.is_admin:
+            return jsonify(error='Admin privileges required.'), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+# List users
+@api_bp.route('/users')
+@api_admin_required
+def users():
+    """List users as JSON."""
+    return api_controller.list_users()
+
+
+# Revoke an API token
+@api_bp.route('/tokens/<int:token_id>', methods=['DELETE'])
+@api_login_required
+def revoke_token(token_id):
+    """Revoke an API token."""
+    return api_controller.revoke_token(token_id)
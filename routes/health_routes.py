@@ -0,0 +1,26 @@
+"""
+Health Routes
+=============
+URL routes for liveness and readiness probes.
+These are public: no login, no organization.
+"""
+
+from flask import Blueprint
+from controllers import health_controller
+
+# Create blueprint
+health_bp = Blueprint('health', __name__)
+
+
+# Liveness probe
+@health_bp.route('/healthz')
+def liveness():
+    """Check that the worker is alive."""
+    return health_controller.liveness()
+
+
+# Readiness probe
+@health_bp.route('/readyz')
+def readiness():
+    """Check that the worker can serve traffic."""
+    return health_controller.readiness()
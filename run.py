@@ -4,11 +4,17 @@ Application Entry Point
 This is the main file to run the Flask application.
 Run with: python run.py
 """
+import os
 from flask import Flask
-from extensions import db, login_manager
+from extensions import db, login_manager, migrate, compress
 from models.user import User
 from config import config
 from helper import seed_database
+from db_routing import init_db_routing
+from tenancy import init_tenancy
+from asset_pipeline import init_assets
+from logging_config import configure_logging
+from warmup import warmup
 
 # Create Flask app instance
 app = Flask(__name__)
@@ -16,26 +22,52 @@ app = Flask(__name__)
 # Load configuration
 app.config.from_object(config['development'])
 
+# Configure structured, queue-based logging before anything logs
+configure_logging(app)
+
 # Initialize extensions with app
 db.init_app(app)
 login_manager.init_app(app)
+init_db_routing(app, db)
+init_tenancy(app)
+compress.init_app(app)
+init_assets(app)
+migrate.init_app(app, db, directory=os.path.join(app.root_path, 'migrations'),
+                 render_as_batch=True)  # batch mode lets SQLite ALTER tables
 
 # Setup user loader for flask-login
 from models.user import User
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user by ID for flask-login."""
-    return User.query.get(int(user_id))
+    """Load user by ID for flask-login (before the tenant is known)."""
+    return User.query.execution_options(all_tenants=True).get(int(user_id))
+
+# Authenticate API clients via "Authorization: Bearer <token>"
+from api_tokens import load_user_from_request
+
+login_manager.request_loader(load_user_from_request)
 
 # Register Blueprints (Routes)
 from routes.auth_routes import auth_bp
 from routes.admin_routes import admin_bp
 from routes.user_routes import user_bp
+from routes.api_routes import api_bp
+from routes.health_routes import health_bp
 
 app.register_blueprint(auth_bp, url_prefix='/auth')
 app.register_blueprint(admin_bp, url_prefix='/admin')
 app.register_blueprint(user_bp, url_prefix='/user')
+app.register_blueprint(api_bp, url_prefix='/api')
+app.register_blueprint(health_bp)  # /healthz and /readyz
+
+# Register CLI commands (flask --app run backfill|assets|orgs|tokens ...)
+from commands import backfill_cli, assets_cli, orgs_cli, tokens_cli
+
+app.cli.add_command(backfill_cli)
+app.cli.add_command(assets_cli)
+app.cli.add_command(orgs_cli)
+app.cli.add_command(tokens_cli)
 
 # Add a root route that redirects to login
 @app.route('/')
@@ -48,6 +80,10 @@ def index():
 # Seed the database with admin user
 seed_database(app)
 
+# Prime DB pools, templates and caches before /readyz reports ready
+if app.config['WARMUP_ON_START']:
+    warmup(app)
+
 if __name__ == '__main__':
     # Run the development server
     app.run(debug=True, host='0.0.0.0', port=6060)
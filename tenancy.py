@@ -0,0 +1,118 @@
+"""
+Tenancy
+=======
+Organization (tenant) isolation for tenant-scoped models.
+
+Every request from a logged-in user runs with that user's organization
+as the current tenant. While a tenant is set, every ORM SELECT against a
+`TenantScoped` model (`User.query...`, `db.session.get(...)`, lazy
+loads) automatically gets an `org_id = <tenant>` condition, so
+controllers and form validators never see rows of other organizations.
+
+Without a current tenant (CLI commands, seeding, the login page before
+an organization is chosen) queries are not filtered. Code that must
+look across tenants inside a request uses:
+    User.query.execution_options(all_tenants=True)
+"""
+
+from contextlib import contextmanager
+
+from flask import g, has_app_context, request
+from flask_login import current_user
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Column, ForeignKey, Integer, event
+from sqlalchemy.orm import declared_attr, with_loader_criteria
+
+# Execution option that disables the automatic tenant filter
+ALL_TENANTS_OPTION = 'all_tenants'
+
+# Public files and health probes; they never touch the user session
+PUBLIC_ENDPOINTS = {'static', 'assets', 'health.liveness', 'health.readiness'}
+
+
+class TenantScoped:
+    """Mixin for models partitioned by organization."""
+
+    @declared_attr
+    def org_id(cls):
+        """Organization (tenant) the row belongs to."""
+        return Column(Integer, ForeignKey('organizations.id'), nullable=False)
+
+
+def get_current_org_id():
+    """
+    Get the current tenant.
+
+    Returns:
+        Organization ID, or None when no tenant is active
+    """
+    if not has_app_context():
+        return None
+    return g.get('org_id')
+
+
+def set_current_org_id(org_id):
+    """
+    Set the tenant for the rest of the current app context.
+
+    Args:
+        org_id: Organization ID (None clears the tenant)
+    """
+    g.org_id = org_id
+
+
+@contextmanager
+def tenant_scope(org_id):
+    """
+    Temporarily run queries as tenant `org_id`.
+
+    Usage:
+        with tenant_scope(org.id):
+            user = User.query.filter_by(username=name).first()
+    """
+    previous = get_current_org_id()
+    set_current_org_id(org_id)
+    try:
+        yield
+    finally:
+        set_current_org_id(previous)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _filter_by_tenant(execute_state):
+    """Add the current tenant's criteria to ORM SELECTs."""
+    if (
+        not execute_state.is_select
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get(ALL_TENANTS_OPTION, False)
+    ):
+        return
+
+    org_id = get_current_org_id()
+    if org_id is None:
+        return
+
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(
+            TenantScoped,
+            lambda cls: cls.org_id == org_id,
+            include_aliases=True,
+        )
+    )
+
+
+def init_tenancy(app):
+    """
+    Activate the logged-in user's organization for every request.
+
+    Args:
+        app: Flask application instance
+    """
+    @app.before_request
+    def bind_current_tenant():
+        """Scope this request to the current user's organization."""
+        if request.endpoint in PUBLIC_ENDPOINTS:
+            return
+        if current_user.is_authenticated:
+            set_current_org_id(current_user.org_id)
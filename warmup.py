@@ -0,0 +1,189 @@
+"""
+Worker Warmup
+=============
+Gets a freshly started worker ready before it takes traffic, so the
+first requests after a deploy do not pay for cold caches:
+
+- opens WARMUP_DB_CONNECTIONS pooled connections per database engine
+  (primary and replicas) and returns them to the pool,
+- compiles every HTML template into Jinja's template cache,
+- loads the asset manifest,
+- fills the API token cache and runs the per-request user lookup once,
+  so its SQL is in SQLAlchemy's compiled-statement cache.
+
+`/readyz` reports "not ready" until `warmup(app)` has finished and every
+step has succeeded. A step that fails is logged and retried by the next
+readiness probe (`retry_failed_steps`), so a worker that started while
+e.g. the database was briefly down becomes ready once it recovers.
+
+run.py calls `warmup(app)` at import time when WARMUP_ON_START is set,
+which runs in every worker before it accepts connections. When the app
+is preloaded in a parent process before forking, disable
+WARMUP_ON_START and call `warmup(app)` from the worker's post-fork hook
+instead, so pooled connections are not shared across processes.
+"""
+
+import logging
+import time
+import sqlalchemy as sa
+from api_tokens import warm_token_cache
+from asset_pipeline import load_manifest
+from extensions import db
+from helper import schema_is_current
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# app.extensions key holding the WarmupStatus
+WARMUP_KEY = 'warmup'
+
+
+class WarmupStatus:
+    """
+    Outcome of the warmup of this worker.
+
+    Attributes:
+        ready: True once warmup has finished
+        duration_ms: Time warmup took
+        steps: Dict of step name -> result (or {'error': ...} if it failed)
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.duration_ms = None
+        self.steps = {}
+
+    @property
+    def failed_steps(self):
+        """Names of the steps that raised."""
+        return [name for name, result in self.steps.items()
+                if isinstance(result, dict) and 'error' in result]
+
+
+def _prime_connections(app):
+    """
+    Open pooled connections on every engine and return them to the pool.
+
+    Returns:
+        Dict of bind key -> connections opened, or the error name
+    """
+    wanted = app.config['WARMUP_DB_CONNECTIONS']
+    primed = {}
+    for key, engine in db.engines.items():
+        name = key or 'primary'
+        size = getattr(engine.pool, 'size', None)
+        count = min(wanted, size()) if callable(size) else 1
+
+        connections = []
+        try:
+            # Hold them all at once so the pool really creates `count` of them
+            for _ in range(count):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(sa.text('SELECT 1'))
+            primed[name] = count
+        except sa.exc.DBAPIError as exc:
+            logger.warning('Warmup could not connect to %s', name, exc_info=True)
+            primed[name] = type(exc).__name__
+        finally:
+            for connection in connections:
+                connection.close()
+    return primed
+
+
+def _compile_templates(app):
+    """
+    Load every HTML template so it is compiled and cached.
+
+    Returns:
+        Number of templates compiled
+    """
+    names = app.jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def _fill_user_caches(app):
+    """
+    Fill the API token cache and compile the per-request user lookup.
+
+    Skipped while migrations are pending (e.g. when `flask db upgrade`
+    itself imports the app), since the tables may not exist yet.
+
+    Returns:
+        Dict with the number of cached tokens
+    """
+    if not schema_is_current():
+        return {'skipped': 'schema not current'}
+    tokens = warm_token_cache()
+    User.query.execution_options(all_tenants=True).get(0)
+    return {'tokens': tokens}
+
+
+# Steps run in order by warmup()
+WARMUP_STEPS = (
+    ('connections', _prime_connections),
+    ('templates', _compile_templates),
+    ('assets', lambda app: len(load_manifest(app))),
+    ('caches', _fill_user_caches),
+)
+
+
+def _run_steps(app, status, names):
+    """Run the warmup steps in `names`, recording results in `status`."""
+    for name, step in WARMUP_STEPS:
+        if name not in names:
+            continue
+        try:
+            status.steps[name] = step(app)
+        except Exception as exc:
+            logger.exception('Warmup step %s failed', name)
+            status.steps[name] = {'error': type(exc).__name__}
+            db.session.rollback()
+
+
+def warmup(app):
+    """
+    Warm up this worker and mark it ready.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        WarmupStatus (also stored in app.extensions['warmup'])
+    """
+    status = WarmupStatus()
+    app.extensions[WARMUP_KEY] = status
+    started = time.perf_counter()
+
+    with app.app_context():
+        _run_steps(app, status, [name for name, _ in WARMUP_STEPS])
+        db.session.remove()
+
+    status.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    status.ready = True
+    logger.info('Warmup finished in %s ms', status.duration_ms,
+                extra={'warmup': status.steps})
+    return status
+
+
+def retry_failed_steps(app, status):
+    """
+    Run the steps that failed during warmup again.
+
+    Must be called inside an application context.
+
+    Args:
+        app: Flask application instance
+        status: WarmupStatus of this worker
+
+    Returns:
+        Names of the steps that still fail
+    """
+    failed = status.failed_steps
+    if failed:
+        _run_steps(app, status, failed)
+        if not status.failed_steps:
+            logger.info('Warmup steps %s succeeded on retry', ', '.join(failed))
+    return status.failed_steps